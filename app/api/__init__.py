@@ -5,7 +5,9 @@ from fastapi.responses import JSONResponse
 from fastapi_pagination import add_pagination
 from starlette.exceptions import HTTPException
 
+from app.api.v1.dependencies import token_user_id
 from app.api.v1.endpoints import api_router
+from app.db.replica import mark_write
 from settings import settings
 
 api = FastAPI(
@@ -14,6 +16,8 @@ api = FastAPI(
     contact={"name": settings.AUTHOR_NAME, "url": settings.AUTHOR_URL, "email": settings.AUTHOR_EMAIL},
 )
 
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
 api.include_router(api_router)
 add_pagination(api)
 
@@ -24,15 +28,19 @@ async def http_exception_handler(request, exc):
         return JSONResponse(
             status_code=exc.status_code,
             content={"error_code": exc.status_code, "error_message": exc.detail},
+            headers=getattr(exc, "headers", None),
         )
     elif isinstance(exc.detail, dict):
         return JSONResponse(
             status_code=exc.status_code,
             content=exc.detail,
+            headers=getattr(exc, "headers", None),
         )
 
     return JSONResponse(
-        status_code=exc.status_code, content={"error_code": exc.detail.value, "error_message": exc.detail.phrase}
+        status_code=exc.status_code,
+        content={"error_code": exc.detail.value, "error_message": exc.detail.phrase},
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -48,3 +56,18 @@ async def catch_exceptions_middleware(request: Request, call_next):
             pass
 
         return JSONResponse(status_code=500, content={"error_code": 500, "error_message": "Internal Server Error"})
+
+
+@api.middleware("http")
+async def read_your_writes_middleware(request: Request, call_next):
+    response = await call_next(request)
+
+    # The write is committed when the response is ready, the next reads of the user go to the primary for a while
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        authorization = request.headers.get("Authorization", "")
+        if authorization.lower().startswith("bearer "):
+            user_id = token_user_id(authorization[7:])
+            if user_id is not None:
+                mark_write(user_id)
+
+    return response
@@ -1,27 +1,251 @@
+from hmac import compare_digest
+from typing import Optional, Tuple
+
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBearer,
+    OAuth2PasswordBearer,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.user import UserCore
-from app.db.database import get_db
+from app.core.board import AsyncBoardCore, BoardContext, BoardCore
+from app.core.user import AsyncUserCore, UserCore
+from app.db.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    async_engine,
+    engine,
+    get_db,
+)
+from app.db.replica import async_read_engine, read_engine
 from app.helpers.error_helper import ErrorCode as errors
 from app.helpers.token_helper import verify_access_token
 from app.models.enums import Status
+from app.models.enums.board import BoardStatus, UserRoleType
 from app.models.user import User
 from settings import settings
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/" + settings.APP_VERSION + "/auth/login")
+metrics_bearer = HTTPBearer(auto_error=False)
+
+
+def check_metrics_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(metrics_bearer)):
+    """
+    Allows the requests with the METRICS_TOKEN bearer token, the metrics expose the internals of the process
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+    if credentials is None or not compare_digest(credentials.credentials, settings.METRICS_TOKEN):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.invalid_access_token)
 
 
 def get_current_user(db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)) -> User:
+    return get_user_by_token(db, token)
+
+
+def _verify_token(token: str) -> dict:
     token_data = verify_access_token(token)
-    user = UserCore(db).get_user_by_email(email=token_data["email"], user_status=[Status.active, Status.passive])
+
+    if "sub" not in token_data:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.invalid_access_token)
+
+    return token_data
+
+
+def _check_token_version(user: User, token_data: dict) -> User:
+    if user.token_version != token_data.get("token_version"):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.invalid_access_session)
 
     return user
 
 
+def token_user_id(token: Optional[str]) -> Optional[int]:
+    """
+    Returns the user ID number of a valid token, or None. It does not check the user, only routes the reads.
+    """
+    if not token:
+        return None
+
+    try:
+        return int(_verify_token(token)["sub"])
+    except HTTPException:
+        return None
+
+
+def get_read_db(token: str = Depends(reusable_oauth2)):
+    """
+    Session of the read-only routes, bound to a healthy replica or to the primary as a fallback.
+    The routes whose ETag is built from a primary read must not use it, since a lagging replica
+    would cache stale content under the new ETag.
+    """
+    db = SessionLocal(bind=read_engine(token_user_id(token)) or engine)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(token: str = Depends(reusable_oauth2)):
+    """
+    Async version of get_read_db, all the async routes are read-only and use it
+    """
+    async with AsyncSessionLocal(bind=async_read_engine(token_user_id(token)) or async_engine) as db:
+        yield db
+
+
+def get_user_by_token(db: Session, token: str) -> User:
+    token_data = _verify_token(token)
+
+    user = UserCore(db).get_cached_user_by_id(
+        user_id=int(token_data["sub"]), user_status=[Status.active, Status.passive]
+    )
+
+    return _check_token_version(user, token_data)
+
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_read_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    token_data = _verify_token(token)
+
+    user = await AsyncUserCore(db).get_cached_user_by_id(
+        user_id=int(token_data["sub"]), user_status=[Status.active, Status.passive]
+    )
+
+    return _check_token_version(user, token_data)
+
+
+def get_current_user_read(db: Session = Depends(get_read_db), token: str = Depends(reusable_oauth2)) -> User:
+    """
+    get_current_user of the sync read-only routes, the user is read with the session of get_read_db
+    """
+    return get_user_by_token(db, token)
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     if current_user.status != Status.active:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors.inactive_user)
 
     return current_user
+
+
+async def get_current_active_user_async(current_user: User = Depends(get_current_user_async)) -> User:
+    return get_current_active_user(current_user)
+
+
+def get_current_active_user_read(current_user: User = Depends(get_current_user_read)) -> User:
+    return get_current_active_user(current_user)
+
+
+class BoardAccess:
+    """
+    Resolves the "board_id" path parameter together with the current user's membership in one query.
+    The dependency result is cached by FastAPI for the request, so it is resolved only once.
+    """
+
+    def __init__(self, role=None, board_status=None):
+        self.role = role
+        self.board_status = board_status
+
+    def __call__(
+        self,
+        board_id: int,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_active_user),
+    ) -> BoardContext:
+        return BoardCore(db).get_board_context(
+            board_id=board_id, user=current_user, role=self.role, board_status=self.board_status
+        )
+
+
+class CardAccess(BoardAccess):
+    """
+    Same as BoardAccess, also fetches the active card of the "card_id" path parameter in the same query
+    """
+
+    def __call__(  # type: ignore
+        self,
+        board_id: int,
+        card_id: int,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_active_user),
+    ) -> BoardContext:
+        return BoardCore(db).get_board_context(
+            board_id=board_id, user=current_user, role=self.role, board_status=self.board_status, card_id=card_id
+        )
+
+
+class ReadBoardAccess(BoardAccess):
+    """
+    BoardAccess of the sync read-only routes, the access check runs on the session of get_read_db
+    """
+
+    def __call__(  # type: ignore
+        self,
+        board_id: int,
+        db: Session = Depends(get_read_db),
+        current_user: User = Depends(get_current_active_user_read),
+    ) -> BoardContext:
+        return BoardCore(db).get_board_context(
+            board_id=board_id, user=current_user, role=self.role, board_status=self.board_status
+        )
+
+
+class AsyncBoardAccess(BoardAccess):
+    """
+    BoardAccess of the async routes, the access check runs on the async engine
+    """
+
+    async def __call__(  # type: ignore
+        self,
+        board_id: int,
+        db: AsyncSession = Depends(get_async_read_db),
+        current_user: User = Depends(get_current_active_user_async),
+    ) -> BoardContext:
+        return await AsyncBoardCore(db).get_board_context(
+            board_id=board_id, user=current_user, role=self.role, board_status=self.board_status
+        )
+
+
+class AsyncCardAccess(BoardAccess):
+    """
+    CardAccess of the async routes, the access check runs on the async engine
+    """
+
+    async def __call__(  # type: ignore
+        self,
+        board_id: int,
+        card_id: int,
+        db: AsyncSession = Depends(get_async_read_db),
+        current_user: User = Depends(get_current_active_user_async),
+    ) -> BoardContext:
+        return await AsyncBoardCore(db).get_board_context(
+            board_id=board_id, user=current_user, role=self.role, board_status=self.board_status, card_id=card_id
+        )
+
+
+board_member = BoardAccess()
+board_owner = BoardAccess(role=[UserRoleType.owner])
+active_board_member = BoardAccess(board_status=[BoardStatus.active])
+card_member = CardAccess()
+read_board_member = ReadBoardAccess()
+async_board_member = AsyncBoardAccess()
+async_card_member = AsyncCardAccess()
+
+
+def authorize_board_events(board_id: int, token: str) -> Tuple[User, BoardContext]:
+    """
+    Checks the token and the board membership of an event subscription with a short-lived session,
+    so that the long-lived event connections do not hold a database connection.
+    :return: The user and the BoardContext, both detached from the closed session
+    """
+    db = SessionLocal()
+    try:
+        user = get_current_active_user(get_user_by_token(db, token))
+
+        return user, BoardCore(db).get_board_context(board_id=board_id, user=user)
+    finally:
+        db.close()
@@ -3,6 +3,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
 
+from app.api.v1.dependencies import get_current_active_user
 from app.api.v1.schemas import MessageOut
 from app.api.v1.schemas.auth import (
     EmailVerificationIn,
@@ -13,6 +14,7 @@ from app.api.v1.schemas.auth import (
 from app.core.auth import AuthCore
 from app.core.user import UserCore
 from app.db.database import get_db
+from app.models.user import User
 
 router = APIRouter()
 
@@ -62,3 +64,14 @@ def send_password_reset_mail(
     db: Session = Depends(get_db),
 ):
     return AuthCore(db).send_password_reset_mail(email=email_address)
+
+
+@router.post("/logout-all", response_model=MessageOut, summary="Sign out all sessions")
+def logout_all_sessions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Invalidates every access token of the current user, the token of this request included
+    """
+    return UserCore(db).revoke_user_tokens(current_user)
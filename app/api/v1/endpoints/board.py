@@ -1,30 +1,85 @@
-from typing import Optional
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi_pagination import Page
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from fastapi_pagination import Params
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.dependencies import get_current_active_user
+from app.api.v1.dependencies import (
+    active_board_member,
+    async_board_member,
+    async_card_member,
+    authorize_board_events,
+    board_member,
+    board_owner,
+    card_member,
+    get_async_read_db,
+    get_current_active_user,
+    get_current_active_user_async,
+    get_current_active_user_read,
+    get_read_db,
+    read_board_member,
+)
 from app.api.v1.schemas import MessageOut, MessageOutWithID
 from app.api.v1.schemas.board import (
+    BoardChangesOut,
     BoardDetailOut,
     BoardIn,
     BoardOut,
+    BoardSearchOut,
+    BoardSnapshotOut,
     BoardUpdateIn,
     BoardUserOut,
+    CardBulkIn,
+    CardBulkOut,
+    CardFilterParams,
     CardIn,
+    CardMoveIn,
+    CardMoveOut,
+    CardOrderBy,
     CardOut,
+    CardSearchOut,
     CardUpdateIn,
+    CommentIn,
+    CommentOut,
 )
-from app.core.board import BoardCore
+from app.core.board import AsyncBoardCore, BoardContext, BoardCore
 from app.core.user import UserCore
 from app.db.database import get_db
 from app.helpers.error_helper import ErrorCode as errors
-from app.models.enums.board import BoardStatus, UserRoleType
+from app.helpers.etag_helper import conditional_response, make_etag
+from app.helpers.pagination_helper import (
+    CursorPage,
+    CursorParams,
+    Page,
+    TotalMode,
+    total_mode_query,
+)
+from app.helpers.realtime_helper import hub
+from app.helpers.response_helper import fast_response, page_out
+from app.models.enums.board import UserRoleType
 from app.models.user import User
+from settings import settings
 
 router = APIRouter()
 
+# The counts are columns of the board row, so they are returned without another query
+COUNTS_QUERY = Query(False, description="Include the active card counts per state of the boards")
+
 
 @router.post("/", response_model=MessageOutWithID, summary="Create a new board")
 def create_board(
@@ -38,217 +93,548 @@ def create_board(
 @router.get(
     "/", response_model=Page[BoardOut], summary="List the boards where the current user is a member or an owner"
 )
-def get_all_boards(
+async def get_all_boards(
     search: Optional[str] = None,
     role: Optional[UserRoleType] = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    counts: bool = COUNTS_QUERY,
+    total: TotalMode = total_mode_query(TotalMode.exact),
+    params: Params = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
 ):
-    return BoardCore(db).get_all_boards(user=current_user, search=search, role=role)
+    return fast_response(
+        page_out(
+            BoardOut,
+            await AsyncBoardCore(db).get_all_boards(
+                user=current_user, search=search, role=role, params=params, total_mode=total, counts=counts
+            ),
+        )
+    )
+
+
+@router.get("/cursor", response_model=CursorPage[BoardOut], summary="Cursor paginated version of the board listing")
+async def get_all_boards_by_cursor(
+    search: Optional[str] = None,
+    role: Optional[UserRoleType] = None,
+    counts: bool = COUNTS_QUERY,
+    cursor_params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_active_user_async),
+):
+    return fast_response(
+        page_out(
+            BoardOut,
+            await AsyncBoardCore(db).get_all_boards(
+                user=current_user, search=search, role=role, cursor_params=cursor_params, counts=counts
+            ),
+        )
+    )
+
+
+@router.get(
+    "/search", response_model=Page[BoardSearchOut], summary="Search the boards where the current user is a member"
+)
+def search_boards(
+    q: str = Query(min_length=1, max_length=200, description="Search text"),
+    counts: bool = COUNTS_QUERY,
+    total: TotalMode = total_mode_query(TotalMode.none),
+    params: Params = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user_read),
+):
+    return fast_response(
+        page_out(
+            BoardSearchOut,
+            BoardCore(db).search_boards(user=current_user, search=q, params=params, total_mode=total, counts=counts),
+        )
+    )
+
+
+@router.get(
+    "/card/search", response_model=Page[CardSearchOut], summary="Search the cards of all boards the user is a member"
+)
+def search_all_cards(
+    q: str = Query(min_length=1, max_length=200, description="Search text"),
+    total: TotalMode = total_mode_query(TotalMode.none),
+    params: Params = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user_read),
+):
+    return fast_response(
+        page_out(
+            CardSearchOut, BoardCore(db).search_cards(user=current_user, search=q, params=params, total_mode=total)
+        )
+    )
 
 
 @router.get(
     "/{board_id}", response_model=BoardDetailOut, summary="View board details where current user is a member or owner"
 )
-def get_board_detail(
-    board_id: int,
+async def get_board_detail(
+    request: Request,
+    response: Response,
+    context: BoardContext = Depends(async_board_member),
+):
+    board = context.board
+    not_modified = conditional_response(
+        request, response, etag=make_etag("board", board.id, board.date_modified), last_modified=board.date_modified
+    )
+    if not_modified:
+        return not_modified
+
+    return fast_response(BoardCore.get_board_detail(board=board), response)
+
+
+@router.get(
+    "/{board_id}/snapshot",
+    response_class=StreamingResponse,
+    responses={200: {"model": BoardSnapshotOut, "content": {"application/json": {}}}},
+    summary="Board, members and active cards in one response",
+)
+def get_board_snapshot(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_member),
 ):
-    check_board = BoardCore(db).get_board_by_id(board_id=board_id)
-    check_board_member = BoardCore(db).check_board_member(board=check_board, user=current_user)  # noqa
+    """
+    Everything the board view needs for the initial render. The response is streamed while the cards are read.
+    """
+    not_modified = conditional_response(request, response, etag=context.etag("snapshot"))
+    if not_modified:
+        return not_modified
+
+    return StreamingResponse(
+        BoardCore(db).get_board_snapshot(board=context.board, role=context.role),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
+
 
-    return BoardCore(db).get_board_detail(board_id=check_board.id)
+@router.get(
+    "/{board_id}/changes", response_model=BoardChangesOut, summary="Changes of the board after the given cursor"
+)
+def get_board_changes(
+    since: int = Query(ge=0, description="The cursor of the previous response or the snapshot"),
+    db: Session = Depends(get_db),
+    context: BoardContext = Depends(board_member),
+):
+    """
+    Returns the board fields, memberships and cards created, updated or deleted after the cursor.
+    If reset is true, the client must fetch the snapshot again and continue from its cursor.
+    """
+    return fast_response(BoardCore(db).get_board_changes(board=context.board, since=since))
+
+
+def _event_token(request_token: Optional[str], authorization: Optional[str]) -> str:
+    if request_token:
+        return request_token
+
+    if authorization and authorization.lower().startswith("bearer "):
+        return authorization[7:]
+
+    raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.invalid_access_token)
+
+
+async def _board_events(board_id: int, token: str) -> AsyncIterator[Optional[dict]]:
+    """
+    Authorizes the subscription and yields the events of the board, None is yielded as a heartbeat.
+    After the "ready" event the client syncs with the change feed from its cursor, the events only
+    tell the client when to sync again. The stream ends when the board is deleted or the membership is lost.
+    """
+    user, context = await run_in_threadpool(authorize_board_events, board_id, token)
+    subscription = hub.subscribe(board_id)
+
+    try:
+        yield {"type": "ready", "board_id": board_id, "version": context.board.version}
+
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.REALTIME_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+
+            yield event
+
+            if event["type"] == "board.deleted":
+                return
+
+            if event["type"] in ("member.updated", "member.removed") and user.id in event["ids"]:
+                try:
+                    await run_in_threadpool(authorize_board_events, board_id, token)
+                except HTTPException:
+                    return
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get("/{board_id}/events", response_class=StreamingResponse, summary="Server-sent events of the board")
+async def board_events(
+    request: Request,
+    board_id: int,
+    access_token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers"),
+):
+    """
+    Streams the board events as text/event-stream. The event data only carries the type, the board version
+    and the changed IDs; the changes themselves are fetched from the change feed.
+    """
+    events = _board_events(board_id, _event_token(access_token, request.headers.get("authorization")))
+
+    # The first event is awaited here, so an authorization error is returned as a normal error response
+    first_event = await events.__anext__()
+
+    async def stream():
+        try:
+            yield "event: ready\ndata: {}\n\n".format(json.dumps(first_event))
+
+            async for event in events:
+                if event is None:
+                    yield ": heartbeat\n\n"
+                else:
+                    yield "event: {}\ndata: {}\n\n".format(event["type"], json.dumps(event))
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.websocket("/{board_id}/ws")
+async def board_websocket(
+    websocket: WebSocket,
+    board_id: int,
+    access_token: Optional[str] = Query(None, description="Access token, for clients that cannot set headers"),
+):
+    """
+    Sends the board events as JSON messages, {"type": "heartbeat"} is sent while idle.
+    Messages of the client are ignored.
+    """
+    try:
+        events = _board_events(board_id, _event_token(access_token, websocket.headers.get("authorization")))
+        first_event = await events.__anext__()
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+
+    async def drain():
+        try:
+            while True:
+                await websocket.receive_text()
+        except WebSocketDisconnect:
+            pass
+
+    receiver = asyncio.ensure_future(drain())
+
+    try:
+        await websocket.send_json(first_event)
+
+        async for event in events:
+            # The client has gone, it is noticed on the next event or heartbeat
+            if receiver.done():
+                return
+
+            await websocket.send_json(event if event is not None else {"type": "heartbeat"})
+
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        await events.aclose()
 
 
 @router.put("/{board_id}", response_model=MessageOut, summary="Update the board you are owner")
 def update_board(
-    board_id: int,
     update_schema: BoardUpdateIn,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_owner),
 ):
     """
     Only the owners of the add can update board. Only the given fields will be updated
     """
-    board = BoardCore(db).get_board_by_id(board_id)
-    board_member = BoardCore(db).check_board_member(
-        board=board, user=current_user, role=[UserRoleType.owner], show_error=False
-    )
-
-    if not board_member:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_board)
-
-    return BoardCore(db).update_board(board=board, update_schema=update_schema)
+    return BoardCore(db).update_board(board=context.board, update_schema=update_schema)
 
 
 @router.delete("/{board_id}", response_model=MessageOut, summary="")
 def delete_board(
-    board_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_owner),
 ):
     """
     Only the owners of the board can delete.
     """
-    board = BoardCore(db).get_board_by_id(board_id)
-    board_member = BoardCore(db).check_board_member(
-        board=board, user=current_user, role=[UserRoleType.owner], show_error=False
-    )
-
-    if not board_member:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_board)
-
-    return BoardCore(db).delete_board(board=board)
+    return BoardCore(db).delete_board(board=context.board)
 
 
 @router.get("/{board_id}/user", response_model=Page[BoardUserOut])
 def get_board_users(
-    board_id: int,
+    request: Request,
+    response: Response,
+    total: TotalMode = total_mode_query(TotalMode.exact),
+    params: Params = Depends(),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_member),
+):
+    not_modified = conditional_response(request, response, etag=context.etag("users", request.url.query))
+    if not_modified:
+        return not_modified
+
+    return fast_response(
+        page_out(BoardUserOut, BoardCore(db).get_board_users(board=context.board, params=params, total_mode=total)),
+        response,
+    )
+
+
+@router.get("/{board_id}/user/cursor", response_model=CursorPage[BoardUserOut])
+def get_board_users_by_cursor(
+    request: Request,
+    response: Response,
+    cursor_params: CursorParams = Depends(),
+    db: Session = Depends(get_db),
+    context: BoardContext = Depends(board_member),
 ):
-    board = BoardCore(db).get_board_by_id(board_id)
-    return BoardCore(db).get_board_users(board=board)
+    not_modified = conditional_response(request, response, etag=context.etag("users_cursor", request.url.query))
+    if not_modified:
+        return not_modified
+
+    return fast_response(
+        page_out(BoardUserOut, BoardCore(db).get_board_users(board=context.board, cursor_params=cursor_params)),
+        response,
+    )
 
 
 @router.post("/{board_id}/user/{user_id}", response_model=MessageOut)
 def add_board_user(
-    board_id: int,
     user_id: int,
     role: UserRoleType,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_owner),
 ):
     """
     Only the owners of the board can add a member
     """
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(
-        board=board, user=current_user, role=[UserRoleType.owner], show_error=False
-    )
-
-    if not board_member:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_board)
-
     user = UserCore(db).get_user_by_id(user_id=user_id)
 
-    return BoardCore(db).add_board_user(board=board, user=user, role=role)
+    return BoardCore(db).add_board_user(board=context.board, user=user, role=role)
 
 
 @router.put("/{board_id}/user/{user_id}", response_model=MessageOut)
 def update_board_user(
-    board_id: int,
     user_id: int,
     role: UserRoleType,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_owner),
 ):
     """
     Only the owners of the board can update a member
     """
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(
-        board=board, user=current_user, role=[UserRoleType.owner], show_error=False
-    )
-
-    if not board_member:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_board)
-
     user = UserCore(db).get_user_by_id(user_id=user_id)
 
-    return BoardCore(db).update_board_user(board=board, user=user, role=role)
+    return BoardCore(db).update_board_user(board=context.board, user=user, role=role)
 
 
 @router.delete("/{board_id}/user/{user_id}", response_model=MessageOut)
 def delete_board_user(
-    board_id: int,
     user_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(board_owner),
 ):
     """
     Only the owners of the board can delete a member.
     """
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(
-        board=board, user=current_user, role=[UserRoleType.owner], show_error=False
-    )
-
-    if not board_member:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_board)
-
     user = UserCore(db).get_user_by_id(user_id=user_id)
 
-    return BoardCore(db).delete_board_user(board=board, user=user)
+    return BoardCore(db).delete_board_user(board=context.board, user=user)
 
 
 @router.post("/{board_id}/card", response_model=MessageOut, summary="Create a card for the board")
 def create_card(
-    board_id: int,
     create_schema: CardIn,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(active_board_member),
 ):
-    board = BoardCore(db).get_board_by_id(board_id=board_id, board_status=[BoardStatus.active])
-    board_member = BoardCore(db).check_board_member(board=board, user=current_user)  # noqa
-
-    return BoardCore(db).create_card(board=board, owner=current_user, create_schema=create_schema)
+    return BoardCore(db).create_card(board=context.board, owner=current_user, create_schema=create_schema)
 
 
-@router.get("/{board_id}/card", response_model=Page[CardOut])
-def get_all_cards(
-    board_id: int,
+@router.post("/{board_id}/card/bulk", response_model=CardBulkOut, summary="Apply a batch of card operations")
+def bulk_cards(
+    bulk_schema: CardBulkIn,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(active_board_member),
+):
+    """
+    Creates, updates, moves (changes the state of) and deletes the cards of the board in a single transaction.
+    The result of each item is returned in the order of the request.
+    """
+    return BoardCore(db).bulk_cards(
+        board=context.board, owner=current_user, items=bulk_schema.items, atomic=bulk_schema.atomic
+    )
+
+
+@router.get("/{board_id}/card", response_model=Page[CardOut])
+async def get_all_cards(
+    request: Request,
+    response: Response,
+    order_by: CardOrderBy = Query(
+        CardOrderBy.id,
+        description="Sort field, prefix with - for descending order. Empty dates are last, or first when descending",
+    ),
+    total: TotalMode = total_mode_query(TotalMode.estimate),
+    filters: CardFilterParams = Depends(),
+    params: Params = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    context: BoardContext = Depends(async_board_member),
 ):
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(board=board, user=current_user)  # noqa
+    """
+    Without filters other than the state, the total is read from the card counters of the board and it is exact.
+    Otherwise it is estimated by default, use total=exact to count the cards.
+    """
+    not_modified = conditional_response(request, response, etag=context.etag("cards", request.url.query))
+    if not_modified:
+        return not_modified
 
-    return BoardCore(db).get_all_cards(board=board)
+    cards = await AsyncBoardCore(db).get_all_cards(
+        board=context.board, filters=filters, order_by=order_by, params=params, total_mode=total
+    )
+
+    return fast_response(page_out(CardOut, cards), response)
+
+
+@router.get(
+    "/{board_id}/card/cursor",
+    response_model=CursorPage[CardOut],
+    summary="Cursor paginated version of the card listing",
+)
+async def get_all_cards_by_cursor(
+    request: Request,
+    response: Response,
+    filters: CardFilterParams = Depends(),
+    cursor_params: CursorParams = Depends(),
+    db: AsyncSession = Depends(get_async_read_db),
+    context: BoardContext = Depends(async_board_member),
+):
+    not_modified = conditional_response(request, response, etag=context.etag("cards_cursor", request.url.query))
+    if not_modified:
+        return not_modified
+
+    cards = await AsyncBoardCore(db).get_all_cards(board=context.board, filters=filters, cursor_params=cursor_params)
+
+    return fast_response(page_out(CardOut, cards), response)
+
+
+@router.get("/{board_id}/card/search", response_model=Page[CardSearchOut], summary="Search the cards of a board")
+def search_cards(
+    q: str = Query(min_length=1, max_length=200, description="Search text"),
+    total: TotalMode = total_mode_query(TotalMode.none),
+    params: Params = Depends(),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_active_user_read),
+    context: BoardContext = Depends(read_board_member),
+):
+    cards = BoardCore(db).search_cards(
+        user=current_user, search=q, board=context.board, params=params, total_mode=total
+    )
+
+    return fast_response(page_out(CardSearchOut, cards))
 
 
 @router.get("/{board_id}/card/{card_id}", response_model=CardOut, summary="Returns the card detail of a board")
-def get_card_detail(
-    board_id: int,
-    card_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+async def get_card_detail(
+    request: Request,
+    response: Response,
+    context: BoardContext = Depends(async_card_member),
 ):
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(board=board, user=current_user)  # noqa
+    card = context.card
+    not_modified = conditional_response(
+        request, response, etag=make_etag("card", card.id, card.date_modified), last_modified=card.date_modified
+    )
+    if not_modified:
+        return not_modified
 
-    return BoardCore(db).get_card_detail(board=board, card_id=card_id)
+    return fast_response(BoardCore.get_card_detail(card=card), response)
 
 
 @router.put("/{board_id}/card/{card_id}", response_model=MessageOut)
 def update_card(
-    board_id: int,
-    card_id: int,
     update_schema: CardUpdateIn,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(card_member),
 ):
     """
     Only the owners of the board can update the card. Only the given fields will be updated.
     """
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(board=board, user=current_user)  # noqa
-    card = BoardCore(db).get_card_by_id(board=board, card_id=card_id)
-    return BoardCore(db).update_card(card=card, update_schema=update_schema)
+    return BoardCore(db).update_card(card=context.card, update_schema=update_schema)
+
+
+@router.put("/{board_id}/card/{card_id}/move", response_model=CardMoveOut, summary="Move the card on the board")
+def move_card(
+    move_schema: CardMoveIn,
+    db: Session = Depends(get_db),
+    context: BoardContext = Depends(card_member),
+):
+    """
+    Places the card after or before another card of the target state, the state and the position are changed together.
+    Without a neighbour the card is moved to the end of the state.
+    """
+    return BoardCore(db).move_card(card=context.card, move_schema=move_schema)
 
 
 @router.delete("/{board_id}/card/{card_id}", response_model=MessageOut)
 def delete_card(
-    board_id: int,
-    card_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(card_member),
 ):
     """
     Only the owners of the board can delete a member
     """
-    board = BoardCore(db).get_board_by_id(board_id=board_id)
-    board_member = BoardCore(db).check_board_member(board=board, user=current_user)  # noqa
-    card = BoardCore(db).get_card_by_id(board=board, card_id=card_id)
-    return BoardCore(db).delete_card(card=card)
+    return BoardCore(db).delete_card(card=context.card)
+
+
+@router.post("/{board_id}/card/{card_id}/comment", response_model=MessageOutWithID, summary="Comment on the card")
+def create_comment(
+    create_schema: CommentIn,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(card_member),
+):
+    return BoardCore(db).create_comment(card=context.card, user=current_user, create_schema=create_schema)
+
+
+@router.get(
+    "/{board_id}/card/{card_id}/comment",
+    response_model=CursorPage[CommentOut],
+    summary="Cursor paginated comments of the card, oldest first",
+)
+def get_comments(
+    request: Request,
+    response: Response,
+    cursor_params: CursorParams = Depends(),
+    db: Session = Depends(get_db),
+    context: BoardContext = Depends(card_member),
+):
+    not_modified = conditional_response(
+        request, response, etag=context.etag("comments", context.card.id, request.url.query)
+    )
+    if not_modified:
+        return not_modified
+
+    return fast_response(
+        page_out(CommentOut, BoardCore(db).get_comments(card=context.card, cursor_params=cursor_params)), response
+    )
+
+
+@router.delete("/{board_id}/card/{card_id}/comment/{comment_id}", response_model=MessageOut)
+def delete_comment(
+    comment_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user),
+    context: BoardContext = Depends(card_member),
+):
+    """
+    Only the user who wrote the comment and the owners of the board can delete the comment
+    """
+    return BoardCore(db).delete_comment(context=context, comment_id=comment_id, user=current_user)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Depends
+
+from app.api.v1.dependencies import check_metrics_token
+from app.helpers.metrics_helper import metrics
+
+router = APIRouter()
+
+
+@router.get(
+    "/",
+    summary="Process-local cache counters, gauges and latency timers",
+    dependencies=[Depends(check_metrics_token)],
+)
+def get_metrics():
+    return metrics.snapshot()
@@ -1,21 +1,35 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter
 
+from app.api.v1.schemas.task import JobOut, JobStatusOut
 from app.core.task import TaskCore
-from app.db.database import get_db
 
 router = APIRouter()
 
 
-@router.get("/card-start-reminder", summary="Send a message to cardholders whose estimated start date has passed")
-def card_start_reminder(
-    db: Session = Depends(get_db),
-):
-    return TaskCore(db).card_start_reminder()
+@router.get(
+    "/card-start-reminder",
+    response_model=JobOut,
+    summary="Send a message to cardholders whose estimated start date has passed",
+)
+def card_start_reminder():
+    """
+    The cards are scanned and the mails are sent by the workers, the job ID is returned immediately.
+    """
+    return TaskCore.start_job("card_start_reminder")
 
 
-@router.get("/card-finish-reminder", summary="Send a message to the admin for cards past the estimated start date.")
-def card_finish_reminder(
-    db: Session = Depends(get_db),
-):
-    return TaskCore(db).card_finish_reminder()
+@router.get(
+    "/card-finish-reminder",
+    response_model=JobOut,
+    summary="Send a message to the admin for cards past the estimated start date.",
+)
+def card_finish_reminder():
+    """
+    The cards are scanned and the mails are sent by the workers, the job ID is returned immediately.
+    """
+    return TaskCore.start_job("card_finish_reminder")
+
+
+@router.get("/job/{job_id}", response_model=JobStatusOut, summary="Status of a reminder job")
+def get_job(job_id: str):
+    return TaskCore.get_job(job_id)
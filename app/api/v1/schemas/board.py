@@ -1,10 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field, PositiveInt
+from fastapi import Query
+from pydantic import BaseModel, Field, PositiveInt, root_validator
 
-from app.api.v1.schemas import BaseOutModel
+from app.api.v1.schemas import BaseOutModel, MessageOut
+from app.models.enums import State, Status
 from app.models.enums.board import BoardStatus, CardState, UserRoleType
+from settings import settings
 
 
 class BoardIn(BaseModel):
@@ -15,6 +19,13 @@ class BoardIn(BaseModel):
 class BoardOut(BoardIn, BaseOutModel):
     status: BoardStatus = Field(title="Board Status")
     role: UserRoleType = Field(title="User Role", description="User role in the board")
+    card_counts: Optional[Dict[CardState, int]] = Field(
+        None, title="Card Counts", description='Active cards per state, only returned with "counts=true"'
+    )
+
+
+class BoardSearchOut(BoardOut):
+    rank: float = Field(title="Rank", description="Relevance of the board to the search")
 
 
 class BoardDetailOut(BoardIn, BaseOutModel):
@@ -54,5 +65,174 @@ class CardUpdateIn(CardIn):
 
 
 class CardOut(CardIn, BaseOutModel):
+    position: Optional[str] = Field(title="Position", description="Rank of the card in its state, sorts as bytes")
+    comment_count: int = Field(0, title="Comment Count", description="Number of the comments of the card")
+
     class Config:
         orm_mode = True
+
+
+class CommentIn(BaseModel):
+    content: str = Field(title="Comment Content", description="Content of the comment", min_length=1, max_length=5000)
+
+
+class CommentOut(CommentIn, BaseOutModel):
+    user_id: int = Field(title="User ID", description="ID number of the user who wrote the comment")
+    full_name: str = Field(title="User Full Name", description="Full name of the user who wrote the comment")
+
+    class Config:
+        orm_mode = True
+
+
+class CardSearchOut(CardOut):
+    board_id: int = Field(title="Board ID", description="ID number of the board of the card")
+    rank: float = Field(title="Rank", description="Relevance of the card to the search")
+
+
+class BoardSnapshotOut(BaseModel):
+    cursor: int = Field(title="Cursor", description='Board version of the snapshot, the "since" of the change feed')
+    board: BoardOut
+    members: List[BoardUserOut]
+    cards: Dict[CardState, List[CardOut]] = Field(
+        title="Cards", description="Active cards grouped by state, states without cards are left out"
+    )
+
+
+class BoardUserChangeOut(BoardUserOut):
+    status: State = Field(title="Membership Status", description="Removed memberships are declined")
+    seq: int = Field(title="Sequence", description="Board version of the change")
+
+
+class CardChangeOut(CardOut):
+    status: Status = Field(title="Card Status", description="Deleted cards are reported with the deleted status")
+    seq: int = Field(title="Sequence", description="Board version of the change")
+
+
+class BoardChangesOut(BaseModel):
+    cursor: int = Field(title="Cursor", description='Board version to be sent as "since" in the next request')
+    reset: bool = Field(
+        title="Reset", description="Too many changes or an unknown cursor, the board must be fetched again"
+    )
+    board: Optional[BoardDetailOut] = Field(title="Board", description="Only given if the board itself changed")
+    members: List[BoardUserChangeOut]
+    cards: List[CardChangeOut]
+
+
+class CardOrderBy(str, Enum):
+    id = "id"
+    id_desc = "-id"
+    date_created = "date_created"
+    date_created_desc = "-date_created"
+    date_modified = "date_modified"
+    date_modified_desc = "-date_modified"
+    estimated_start = "estimated_start"
+    estimated_start_desc = "-estimated_start"
+    estimated_finish = "estimated_finish"
+    estimated_finish_desc = "-estimated_finish"
+    position = "position"
+    position_desc = "-position"
+
+
+class CardMoveIn(BaseModel):
+    state: Optional[CardState] = Field(title="Card State", description="New state of the card, defaults to the current")
+    after_id: Optional[PositiveInt] = Field(title="After", description="The card to be placed after")
+    before_id: Optional[PositiveInt] = Field(title="Before", description="The card to be placed before")
+
+    @root_validator(skip_on_failure=True)
+    def check_neighbour(cls, values):
+        if values.get("after_id") is not None and values.get("before_id") is not None:
+            raise ValueError("only one of after_id and before_id can be given")
+
+        return values
+
+
+class CardMoveOut(MessageOut):
+    position: str = Field(title="Position", description="New position of the card")
+
+
+class CardFilterParams:
+    """
+    Query parameters of the card listing filters, all of them are applied in SQL
+    """
+
+    def __init__(
+        self,
+        state: Optional[List[CardState]] = Query(None, description="Card states, can be given more than once"),
+        assignment_id: Optional[int] = Query(None, description="The user to whom the card is assigned"),
+        owner_id: Optional[int] = Query(None, description="The user who created the card"),
+        estimated_start_from: Optional[datetime] = Query(None),
+        estimated_start_to: Optional[datetime] = Query(None),
+        estimated_finish_from: Optional[datetime] = Query(None),
+        estimated_finish_to: Optional[datetime] = Query(None),
+    ):
+        self.state = state
+        self.assignment_id = assignment_id
+        self.owner_id = owner_id
+        self.estimated_start_from = estimated_start_from
+        self.estimated_start_to = estimated_start_to
+        self.estimated_finish_from = estimated_finish_from
+        self.estimated_finish_to = estimated_finish_to
+
+
+class CardBulkAction(str, Enum):
+    create = "create"
+    update = "update"
+    move = "move"
+    delete = "delete"
+
+
+class CardBulkItemIn(BaseModel):
+    action: CardBulkAction = Field(title="Action", description="Operation applied to the card")
+    card_id: Optional[PositiveInt] = Field(
+        None, title="Card ID", description="ID number of the card, required by update, move and delete"
+    )
+    card: Optional[CardUpdateIn] = Field(None, title="Card", description="Card fields of create and update")
+    state: Optional[CardState] = Field(None, title="Card State", description="Target state of move")
+
+    @root_validator(skip_on_failure=True)
+    def check_action_fields(cls, values):
+        action = values.get("action")
+
+        if action != CardBulkAction.create and values.get("card_id") is None:
+            raise ValueError("card_id is required for {}".format(action.value))
+
+        if action == CardBulkAction.create and (values.get("card") is None or values["card"].title is None):
+            raise ValueError("card.title is required for create")
+
+        if action == CardBulkAction.update:
+            if values.get("card") is None:
+                raise ValueError("card is required for update")
+
+            # The columns are not nullable, an explicit null can not be written
+            null_fields = [
+                name
+                for name in ("title", "state")
+                if name in values["card"].__fields_set__ and getattr(values["card"], name) is None
+            ]
+            if null_fields:
+                raise ValueError(
+                    "{} can not be null for update".format(", ".join("card." + name for name in null_fields))
+                )
+
+        if action == CardBulkAction.move and values.get("state") is None:
+            raise ValueError("state is required for move")
+
+        return values
+
+
+class CardBulkIn(BaseModel):
+    items: List[CardBulkItemIn] = Field(min_items=1, max_items=settings.CARD_BULK_MAX_SIZE)
+    atomic: bool = Field(False, title="Atomic", description="If any item fails, none of the items are applied")
+
+
+class CardBulkItemOut(BaseModel):
+    index: int = Field(title="Index", description="Position of the item in the request")
+    action: CardBulkAction = Field(title="Action")
+    id: Optional[int] = Field(title="Card ID", description="ID number of the card, created cards included")
+    success: bool = Field(title="Success", description="Whether the item is applied")
+    error_code: Optional[int] = Field(title="Error Code")
+    error_message: Optional[str] = Field(title="Error Message")
+
+
+class CardBulkOut(BaseModel):
+    items: List[CardBulkItemOut]
@@ -0,0 +1,15 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.api.v1.schemas import MessageOut
+
+
+class JobOut(MessageOut):
+    job_id: str
+
+
+class JobStatusOut(BaseModel):
+    job_id: str
+    status: str  # PENDING (also for the unknown IDs), STARTED, SUCCESS, FAILURE or RETRY
+    result: Any  # Number of the reminded cards when the job is successful
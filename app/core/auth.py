@@ -38,13 +38,23 @@ class AuthCore:
             email=email, user_status=[Status.active, Status.passive], show_error=False
         )
 
-        if not user or not self.hash_helper.verify_password(user.password_hash, password):
+        if not user:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_found)
+
+        verified, new_password_hash = self.hash_helper.verify_and_update(user.password_hash, password)
+
+        if not verified:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_found)
 
         if user.status != Status.active:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors.inactive_user)
 
-        access_token = create_access_token({"email": user.email})
+        if new_password_hash:
+            user.password_hash = new_password_hash
+
+        access_token = create_access_token(
+            {"sub": str(user.id), "email": user.email, "status": user.status, "token_version": user.token_version}
+        )
 
         self.db.add(user)
         self.db.commit()
@@ -1,15 +1,214 @@
+from collections import Counter
+from datetime import datetime
+from time import sleep
+from typing import Callable, Dict, Iterator, List, Optional
+
+import orjson
 from fastapi import HTTPException, status
-from fastapi.encoders import jsonable_encoder
+from fastapi_pagination import Params
 from fastapi_pagination import paginate as array_paginate  # noqa
-from fastapi_pagination.ext.sqlalchemy import paginate as sqlalchemy_paginate
+from kombu.exceptions import OperationalError
+from sqlalchemy import (
+    and_,
+    delete,
+    func,
+    insert,
+    literal_column,
+    null,
+    or_,
+    select,
+    update,
+)
 
-from app.api.v1.schemas.board import BoardUpdateIn, CardIn, CardUpdateIn
+from app.api.v1.schemas.board import (
+    BoardDetailOut,
+    BoardOut,
+    BoardUpdateIn,
+    BoardUserChangeOut,
+    BoardUserOut,
+    CardBulkAction,
+    CardBulkItemIn,
+    CardChangeOut,
+    CardFilterParams,
+    CardIn,
+    CardMoveIn,
+    CardOrderBy,
+    CardOut,
+    CardUpdateIn,
+    CommentIn,
+)
 from app.core.user import UserCore
+from app.db.database import is_primary
+from app.helpers.cache_helper import TieredCache
 from app.helpers.error_helper import ErrorCode as errors
-from app.models.board import Board, BoardUser, Card
+from app.helpers.etag_helper import make_etag
+from app.helpers.metrics_helper import metrics
+from app.helpers.pagination_helper import (
+    CursorParams,
+    TotalMode,
+    async_cursor_paginate,
+    async_paginate,
+    cursor_paginate,
+    paginate,
+)
+from app.helpers.rank_helper import even_ranks, rank_between, ranks_between
+from app.helpers.realtime_helper import publish_board_event
+from app.helpers.response_helper import to_out
+from app.models.board import SEARCH_CONFIG, Board, BoardUser, Card, Comment
 from app.models.enums import State, Status
-from app.models.enums.board import BoardStatus, UserRoleType
+from app.models.enums.board import BoardStatus, CardState, UserRoleType
 from app.models.user import User
+from app.worker import celery_app
+from settings import settings
+
+# Fields of CardIn that are written by the bulk create
+CARD_CREATE_FIELDS = list(CardIn.__fields__)
+
+# Card columns returned by the listings, the search vector is left out
+CARD_COLUMNS = [column for column in Card.__table__.columns if column.key != "search_vector"]
+
+# Board columns that count the active cards of each state
+CARD_COUNT_COLUMNS = {state: getattr(Board, "{}_count".format(state.value)) for state in CardState}
+
+# Role and approval state of (board_id, user_id) pairs, {"role": None, "status": None} when there is no membership.
+member_cache = TieredCache(
+    "board_member",
+    max_size=settings.MEMBER_CACHE_SIZE,
+    ttl=settings.MEMBER_CACHE_TTL,
+    local_only_ttl=settings.CACHE_LOCAL_ONLY_TTL,
+)
+
+
+def _search_query(search: str):
+    return func.websearch_to_tsquery(literal_column("'{}'::regconfig".format(SEARCH_CONFIG)), search)
+
+
+def _card_counts_column(counts: bool):
+    """
+    Returns the "card_counts" column of the board listings, the counts are read from the board row itself
+    """
+    if not counts:
+        return null().label("card_counts")
+
+    return func.json_build_object(
+        *[item for state, column in CARD_COUNT_COLUMNS.items() for item in (state.value, column)]
+    ).label("card_counts")
+
+
+def _board_list_filters(user: User, search: Optional[str], role: Optional[UserRoleType]) -> list:
+    filter_array = [
+        BoardUser.user_id == user.id,
+        BoardUser.status == State.approved,
+        Board.status != BoardStatus.deleted,
+    ]
+
+    if search:
+        # Substring match on the name, served by the trigram index. The LIKE wildcards of the text are matched as is.
+        search = "%{}%".format(search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_"))
+        filter_array.append(Board.name.ilike(search, escape="\\"))
+
+    if role:
+        filter_array.append(BoardUser.role == role)
+
+    return filter_array
+
+
+def _board_list_columns(counts: bool) -> list:
+    return [
+        Board.id,
+        Board.name,
+        Board.description,
+        Board.status,
+        Board.date_created,
+        Board.date_modified,
+        BoardUser.role,
+        _card_counts_column(counts),
+    ]
+
+
+def _member_cache_key(board_id: int, user_id: int) -> str:
+    return "{}:{}".format(board_id, user_id)
+
+
+def _membership_to_cache(board_user: Optional[BoardUser]) -> dict:
+    if not board_user:
+        return {"role": None, "status": None}
+
+    return {"role": board_user.role.value, "status": board_user.status.value}
+
+
+def _approved_role(membership: dict) -> Optional[UserRoleType]:
+    if membership["status"] != State.approved:
+        return None
+
+    return UserRoleType(membership["role"])
+
+
+class BoardContext:
+    """
+    Request-scoped result of a board access check. Handlers use it instead of looking the board,
+    the membership or the card up again.
+    """
+
+    def __init__(self, board: Board, role: UserRoleType, card: Optional[Card] = None):
+        self.board = board
+        self.role = role
+        self.card = card
+
+    def etag(self, *variant) -> str:
+        """
+        Weak ETag of a board read, it changes with the board version and the given variant (e.g. query string)
+        """
+        return make_etag(self.board.id, self.board.version, self.role.value, *variant)
+
+
+def _board_context_query(board_id: int, user: User, board_status, card_id: Optional[int], membership):
+    if board_status is None:
+        board_status = [BoardStatus.active, BoardStatus.archived]
+
+    if membership is None:
+        query = select(Board, BoardUser).outerjoin(
+            BoardUser, and_(BoardUser.board_id == Board.id, BoardUser.user_id == user.id)
+        )
+    else:
+        query = select(Board)
+
+    query = query.where(Board.id == board_id, Board.status.in_(board_status))
+
+    if card_id is not None:
+        query = query.add_columns(Card).outerjoin(
+            Card, and_(Card.id == card_id, Card.board_id == Board.id, Card.status == Status.active)
+        )
+
+    return query.limit(1)
+
+
+def _board_context_from_row(row, key: str, membership, role, card_id: Optional[int], cache: bool) -> BoardContext:
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.board_not_found)
+
+    if membership is None:
+        membership = _membership_to_cache(row[1])
+        # A membership read from a lagging replica could bring a removed member back into the cache
+        if cache:
+            member_cache.set(key, membership)
+
+    member_role = _approved_role(membership)
+
+    if role is not None and member_role not in role:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_board)
+
+    if member_role is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.user_not_member_the_board)
+
+    card = None
+    if card_id is not None:
+        card = row[-1]
+
+        if not card:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.card_not_found)
+
+    return BoardContext(board=row[0], role=member_role, card=card)
 
 
 class BoardCore:
@@ -81,6 +280,73 @@ class BoardCore:
 
         return board_user
 
+    def get_member_role(self, board_id: int, user_id: int) -> Optional[UserRoleType]:
+        """
+        This function returns the role of the user's approved membership, served from the membership cache when possible
+        :param board_id: ID number of the board
+        :param user_id: ID number of the user
+        :return: UserRoleType or None if the user is not an approved member
+        """
+        key = _member_cache_key(board_id, user_id)
+        membership = member_cache.get(key)
+
+        if membership is None:
+            board_user = (
+                self.db.query(BoardUser).filter(BoardUser.board_id == board_id, BoardUser.user_id == user_id).first()
+            )
+            membership = _membership_to_cache(board_user)
+            if is_primary(self.db):
+                member_cache.set(key, membership)
+
+        return _approved_role(membership)
+
+    @staticmethod
+    def invalidate_member_cache(board_id: int, *user_ids: int):
+        member_cache.delete(*[_member_cache_key(board_id, user_id) for user_id in user_ids])
+
+    def bump_board_version(self, board_id: int, card_counts: Optional[Dict[CardState, int]] = None) -> int:
+        """
+        Increments the version of the board in the current transaction, the ETags of the board reads change with it.
+        The new version is also the change sequence of the rows written in the transaction. The board row stays
+        locked until the commit, so the sequences of a board are assigned in commit order.
+        The modification date is kept, it only tracks the changes of the board row itself.
+        :param card_counts: Changes of the active card counts per state, applied in the same statement
+        :return: New version of the board
+        """
+        values = {
+            CARD_COUNT_COLUMNS[state].key: CARD_COUNT_COLUMNS[state] + delta
+            for state, delta in (card_counts or {}).items()
+            if delta
+        }
+
+        return self.db.execute(
+            update(Board)
+            .where(Board.id == board_id)
+            .values(version=Board.version + 1, date_modified=Board.date_modified, **values)
+            .returning(Board.version)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+
+    def get_board_context(
+        self, board_id: int, user: User, role=None, board_status=None, card_id: Optional[int] = None
+    ) -> BoardContext:
+        """
+        This function fetches the board, the user's membership and optionally the card in a single query.
+        When the membership is cached, only the board (and the card) are queried.
+        :param board_id: ID number of the requested board
+        :param user: User whose membership will be checked
+        :param role: Roles allowed to access. If given, a missing membership or another role is reported as not owner
+        :param board_status: The list must be given (e.g. [BoardStatus.active, BoardStatus.archived]
+        :param card_id: ID number of the requested card. If given, the active card is fetched in the same query
+        :return: BoardContext Object
+        """
+        key = _member_cache_key(board_id, user.id)
+        membership = member_cache.get(key)
+
+        row = self.db.execute(_board_context_query(board_id, user, board_status, card_id, membership)).first()
+
+        return _board_context_from_row(row, key, membership, role, card_id, cache=is_primary(self.db))
+
     # Crud Functions
     def create_board(self, user: User, name: str, description: str = None) -> dict:
         # TODO: Check if there is a different board with the same name that the user is owner.
@@ -98,27 +364,62 @@ class BoardCore:
         owner.role = UserRoleType.owner
         owner.status = State.approved
 
+        board_id, user_id = board.id, user.id
         self.db.add(owner)
         self.db.commit()
 
-        return {"message": "Pano oluşturuldu", "id": board.id}
+        self.invalidate_member_cache(board_id, user_id)
+
+        return {"message": "Pano oluşturuldu", "id": board_id}
+
+    def get_all_boards(
+        self,
+        user: User,
+        search: str = None,
+        role: UserRoleType = None,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.exact,
+        cursor_params: Optional[CursorParams] = None,
+        counts: bool = False,
+    ):
+        boards = (
+            self.db.query(Board)
+            .join(BoardUser, BoardUser.board_id == Board.id)
+            .filter(*_board_list_filters(user, search, role))
+            .with_entities(*_board_list_columns(counts))
+        )
 
-    def get_all_boards(self, user: User, search: str = None, role: UserRoleType = None):
-        filter_array = []
+        if cursor_params is not None:
+            return cursor_paginate(boards, key_columns=[Board.id], params=cursor_params)
 
-        if search:
-            search = "%{}%".format(search)
-            filter_array.append(Board.name.ilike(search))  # noqa
+        return paginate(self.db, boards.order_by(Board.id), params=params, total_mode=total_mode)
 
-        if role:
-            filter_array.append(BoardUser.role == role)
+    def search_boards(
+        self,
+        user: User,
+        search: str,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.none,
+        counts: bool = False,
+    ):
+        """
+        This function searches the name and description of the boards where the user is a member, ordered by relevance
+        :param user: User whose boards will be searched
+        :param search: Search text, web search syntax is supported (e.g. "sprint -done")
+        :param params: Page and size of the request
+        :param total_mode: How the total is calculated
+        :param counts: If true, the active card counts per state are returned
+        :return: Page of the boards with their rank
+        """
+        query = _search_query(search)
+        rank = func.ts_rank(Board.search_vector, query).label("rank")
 
         boards = (
             self.db.query(Board)
             .join(BoardUser, BoardUser.board_id == Board.id)
             .filter(BoardUser.user_id == user.id, BoardUser.status == State.approved)
             .filter(Board.status != BoardStatus.deleted)
-            .filter(*filter_array)
+            .filter(Board.search_vector.op("@@")(query))
             .with_entities(
                 Board.id,
                 Board.name,
@@ -127,13 +428,17 @@ class BoardCore:
                 Board.date_created,
                 Board.date_modified,
                 BoardUser.role,
+                _card_counts_column(counts),
+                rank,
             )
+            .order_by(rank.desc(), Board.id)
         )
 
-        return sqlalchemy_paginate(boards)
+        return paginate(self.db, boards, params=params, total_mode=total_mode)
 
-    def get_board_detail(self, board_id: int) -> dict:
-        return jsonable_encoder(self.get_board_by_id(board_id=board_id))
+    @staticmethod
+    def get_board_detail(board: Board) -> dict:
+        return to_out(BoardDetailOut, board)
 
     def update_board(self, board, update_schema: BoardUpdateIn) -> dict:
         unset_fields = update_schema.dict(exclude_unset=True)
@@ -141,8 +446,12 @@ class BoardCore:
         for key in unset_fields.keys():
             setattr(board, key, unset_fields.get(key))
 
+        board_id = board.id
+        board.seq = version = self.bump_board_version(board_id)
         self.db.commit()
 
+        publish_board_event(board_id, version, "board.updated")
+
         return {"message": "Kart başarıyla düzenlendi"}
 
     def delete_board(self, board: Board):
@@ -150,11 +459,23 @@ class BoardCore:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors.board_already_deleted)
 
         board.status = BoardStatus.deleted
+        board_id = board.id
+        user_ids = [user_id for (user_id,) in self.db.query(BoardUser.user_id).filter(BoardUser.board_id == board_id)]
+        board.seq = version = self.bump_board_version(board_id)
         self.db.commit()
 
+        self.invalidate_member_cache(board_id, *user_ids)
+        publish_board_event(board_id, version, "board.deleted")
+
         return {"message": "Pano başarıyla silindi."}
 
-    def get_board_users(self, board: Board):
+    def get_board_users(
+        self,
+        board: Board,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.exact,
+        cursor_params: Optional[CursorParams] = None,
+    ):
         board_users = (
             self.db.query(BoardUser)
             .join(User, BoardUser.user_id == User.id)
@@ -169,47 +490,173 @@ class BoardCore:
             )
         )
 
-        return sqlalchemy_paginate(board_users)
+        if cursor_params is not None:
+            return cursor_paginate(board_users, key_columns=[BoardUser.id], params=cursor_params)
 
-    def add_board_user(self, board: Board, user: User, role: UserRoleType) -> dict:
-        check_user_member = self.check_board_member(board=board, user=user, show_error=False)
+        return paginate(self.db, board_users.order_by(BoardUser.id), params=params, total_mode=total_mode)
 
-        if check_user_member:
+    def add_board_user(self, board: Board, user: User, role: UserRoleType) -> dict:
+        if self.get_member_role(board_id=board.id, user_id=user.id) is not None:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors.user_already_exists_in_board)
 
-        board_member = BoardUser()
-        board_member.board_id = board.id
-        board_member.user_id = user.id
+        # A removed membership is kept for the change feed, it is approved again instead of adding a new one.
+        board_member = (
+            self.db.query(BoardUser).filter(BoardUser.board_id == board.id, BoardUser.user_id == user.id).first()
+        )
+
+        if not board_member:
+            board_member = BoardUser()
+            board_member.board_id = board.id
+            board_member.user_id = user.id
+            self.db.add(board_member)
+
         board_member.role = role
         board_member.status = State.approved  # TODO: change here when adding invite future
 
-        self.db.add(board_member)
+        board_id, user_id = board.id, user.id
+        board_member.seq = version = self.bump_board_version(board_id)
         self.db.commit()
 
+        self.invalidate_member_cache(board_id, user_id)
+        publish_board_event(board_id, version, "member.added", user_id)
+
         return {"message": "Kullanıcı panoya eklendi"}
 
     def update_board_user(self, board: Board, user: User, role: UserRoleType) -> dict:
         # TODO: Block owner role change if no other admins.
         check_user_member = self.check_board_member(board=board, user=user)
         check_user_member.role = role
+        board_id, user_id = board.id, user.id
+        check_user_member.seq = version = self.bump_board_version(board_id)
         self.db.commit()
 
+        self.invalidate_member_cache(board_id, user_id)
+        publish_board_event(board_id, version, "member.updated", user_id)
+
         return {"message": "Kullanıcının pano rolü güncellendi."}
 
     def delete_board_user(self, board: Board, user: User) -> dict:
         # TODO: Block deletion if no other admins.
         check_user_member = self.check_board_member(board=board, user=user, show_error=True)
 
-        self.db.delete(check_user_member)
+        # Soft deleted, so that the removal can be served by the change feed
+        check_user_member.status = State.decline
+        board_id, user_id = board.id, user.id
+        check_user_member.seq = version = self.bump_board_version(board_id)
         self.db.commit()
 
+        self.invalidate_member_cache(board_id, user_id)
+        publish_board_event(board_id, version, "member.removed", user_id)
+
         return {"message": "Kullanıcı panodan silindi."}
 
+    def get_board_changes(self, board: Board, since: int) -> dict:
+        """
+        This function returns the board, the memberships and the cards changed after the given board version.
+        Soft deleted rows are included with their status. Since the versions are read before the rows, a change
+        may be returned twice but is never missed; clients apply the changes as upserts.
+        :param board: The board, the membership must already be checked
+        :param since: The cursor of the previous response or the snapshot
+        :return: Changes and the cursor of the next request
+        """
+        changes = {"cursor": board.version, "reset": False, "board": None, "members": [], "cards": []}
+
+        if since == board.version:
+            return changes
+
+        # Deleted cards purged after the cursor can not be reported anymore
+        if since > board.version or since < board.purged_seq:
+            return dict(changes, reset=True)
+
+        cards = (
+            self.db.query(*CARD_COLUMNS)
+            .filter(Card.board_id == board.id, Card.seq > since)
+            .order_by(Card.seq, Card.id)
+            .limit(settings.BOARD_CHANGES_MAX_SIZE + 1)
+            .all()
+        )
+
+        if len(cards) > settings.BOARD_CHANGES_MAX_SIZE:
+            return dict(changes, reset=True)
+
+        members = (
+            self.db.query(BoardUser.id, BoardUser.date_created, BoardUser.date_modified, BoardUser.user_id)
+            .add_columns(User.full_name, BoardUser.role, BoardUser.status, BoardUser.seq)
+            .join(User, BoardUser.user_id == User.id)
+            .filter(BoardUser.board_id == board.id, BoardUser.seq > since)
+            .order_by(BoardUser.seq, BoardUser.id)
+        )
+
+        changes["cards"] = [to_out(CardChangeOut, card) for card in cards]
+        changes["members"] = [to_out(BoardUserChangeOut, member) for member in members]
+
+        if board.seq > since:
+            changes["board"] = to_out(BoardDetailOut, board)
+
+        return changes
+
+    @staticmethod
+    def get_card_counts(board: Board) -> Dict[str, int]:
+        return {state.value: getattr(board, column.key) for state, column in CARD_COUNT_COLUMNS.items()}
+
+    def get_board_snapshot(self, board: Board, role: UserRoleType) -> Iterator[bytes]:
+        """
+        This function streams the whole board view as JSON: the board, its members and its active cards grouped
+        by state. Only two queries are issued after the access check and the cards are read with a server-side
+        cursor, so the memory use does not grow with the size of the board.
+        :param board: The board, the membership must already be checked
+        :param role: Role of the current user in the board
+        :return: JSON chunks of the snapshot
+        """
+        yield b'{"cursor":%d,"board":%s,"members":[' % (
+            board.version,
+            orjson.dumps(to_out(BoardOut, board, role=role, card_counts=self.get_card_counts(board=board))),
+        )
+
+        members = (
+            self.db.query(BoardUser.id, BoardUser.date_created, BoardUser.date_modified, BoardUser.user_id)
+            .add_columns(User.full_name, BoardUser.role)
+            .join(User, BoardUser.user_id == User.id)
+            .filter(BoardUser.board_id == board.id, BoardUser.status == State.approved)
+            .order_by(BoardUser.id)
+        )
+        yield b",".join(orjson.dumps(to_out(BoardUserOut, member)) for member in members)
+
+        yield b'],"cards":{'
+        cards = self.db.execute(
+            select(*CARD_COLUMNS)
+            .where(Card.board_id == board.id, Card.status == Status.active)
+            .order_by(Card.state, Card.position, Card.id)
+            .execution_options(stream_results=True, yield_per=settings.BOARD_SNAPSHOT_CHUNK_SIZE)
+        )
+
+        current_state = None
+        for partition in cards.partitions():
+            chunk = []
+
+            for card in partition:
+                if card.state != current_state:
+                    if current_state is not None:
+                        chunk.append(b"],")
+                    chunk.append(orjson.dumps(card.state) + b":[")
+                    current_state = card.state
+                else:
+                    chunk.append(b",")
+
+                chunk.append(orjson.dumps(to_out(CardOut, card)))
+
+            yield b"".join(chunk)
+
+        yield b"]}}" if current_state is not None else b"}}"
+
     def create_card(self, board: Board, owner: User, create_schema: CardIn):
+        create_schema.state = create_schema.state or CardState.todo
+
         if create_schema.assignment_id is not None:
             user = UserCore(self.db).get_user_by_id(create_schema.assignment_id)
 
-            self.check_board_member(board=board, user=user)
+            if self.get_member_role(board_id=board.id, user_id=user.id) is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.user_not_member_the_board)
 
             assignment = user.id
         else:
@@ -226,31 +673,750 @@ class BoardCore:
         card.finish_date = create_schema.finish_date
         card.state = create_schema.state
 
+        board_id = board.id
+        card.seq = version = self.bump_board_version(board_id, card_counts={card.state: 1})
+        card.position = position = rank_between(self._last_position(board_id, card.state), None)
+
         self.db.add(card)
+        self.db.flush()
+        card_id = card.id
         self.db.commit()
 
-        return {"message": "Kart başarıyla oluşturuldu", "id": card.id}
+        publish_board_event(board_id, version, "card.created", card_id)
+        self._check_positions(board_id, card.state, position)
+
+        return {"message": "Kart başarıyla oluşturuldu", "id": card_id}
+
+    @staticmethod
+    def _filter_cards(cards, filters: CardFilterParams):
+        if filters.state:
+            cards = cards.filter(Card.state.in_(filters.state))
 
-    def get_all_cards(self, board: Board):
+        if filters.assignment_id is not None:
+            cards = cards.filter(Card.assignment_id == filters.assignment_id)
+
+        if filters.owner_id is not None:
+            cards = cards.filter(Card.owner_id == filters.owner_id)
+
+        if filters.estimated_start_from is not None:
+            cards = cards.filter(Card.estimated_start >= filters.estimated_start_from)
+
+        if filters.estimated_start_to is not None:
+            cards = cards.filter(Card.estimated_start <= filters.estimated_start_to)
+
+        if filters.estimated_finish_from is not None:
+            cards = cards.filter(Card.estimated_finish >= filters.estimated_finish_from)
+
+        if filters.estimated_finish_to is not None:
+            cards = cards.filter(Card.estimated_finish <= filters.estimated_finish_to)
+
+        return cards
+
+    @staticmethod
+    def _counted_total(board: Board, filters: Optional[CardFilterParams]) -> Optional[int]:
+        """
+        Returns the number of the listed cards from the card counters of the board, or None when the cards are
+        filtered by anything other than the state. The counters are updated with every card write, so it is exact.
+        """
+        states = set(CardState)
+
+        if filters is not None:
+            if any(value is not None for name, value in vars(filters).items() if name != "state"):
+                return None
+
+            states = set(filters.state or states)
+
+        counts = [getattr(board, CARD_COUNT_COLUMNS[state].key) for state in states]
+        if None in counts:
+            return None
+
+        return sum(counts)
+
+    @staticmethod
+    def _order_cards(cards, order_by: CardOrderBy):
+        # Positions are only comparable within a state
+        if order_by == CardOrderBy.position:
+            return cards.order_by(Card.state, Card.position, Card.id)
+
+        if order_by == CardOrderBy.position_desc:
+            return cards.order_by(Card.state.desc(), Card.position.desc(), Card.id.desc())
+
+        column = getattr(Card, order_by.value.lstrip("-"))
+
+        # Served by the (board_id, column, id) indexes, the descending order is their backward scan
+        if order_by.value.startswith("-"):
+            return cards.order_by(column.desc().nullsfirst(), Card.id.desc())
+
+        return cards.order_by(column.asc().nullslast(), Card.id)
+
+    def get_all_cards(
+        self,
+        board: Board,
+        filters: Optional[CardFilterParams] = None,
+        order_by: CardOrderBy = CardOrderBy.id,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.exact,
+        cursor_params: Optional[CursorParams] = None,
+    ):
+        """
+        This function lists the active cards of the board
+        :param board: The board whose cards will be listed
+        :param filters: Card filters, applied in SQL
+        :param order_by: Sort order of the offset listing, the cursor listing is always ordered by ID
+        :param params: Page and size of the request
+        :param total_mode: How the total is calculated when it can not be read from the card counters of the board
+        :param cursor_params: If given, the listing is cursor paginated
+        :return: Page or CursorPage of the cards
+        """
         cards = self.db.query(Card).filter(Card.board_id == board.id).filter(Card.status == Status.active)
 
-        return sqlalchemy_paginate(cards)
+        if filters is not None:
+            cards = self._filter_cards(cards, filters)
+
+        if cursor_params is not None:
+            return cursor_paginate(cards, key_columns=[Card.id], params=cursor_params)
+
+        return paginate(
+            self.db,
+            self._order_cards(cards, order_by),
+            params=params,
+            total_mode=total_mode,
+            known_total=self._counted_total(board, filters),
+        )
+
+    def search_cards(
+        self,
+        user: User,
+        search: str,
+        board: Optional[Board] = None,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.none,
+    ):
+        """
+        This function searches the title and content of the active cards, ordered by relevance
+        :param user: User whose boards will be searched when no board is given
+        :param search: Search text, web search syntax is supported (e.g. "login -android")
+        :param board: Limits the search to the given board, the membership must already be checked
+        :param params: Page and size of the request
+        :param total_mode: How the total is calculated
+        :return: Page of the cards with their rank
+        """
+        query = _search_query(search)
+        rank = func.ts_rank(Card.search_vector, query).label("rank")
 
-    def get_card_detail(self, board: Board, card_id: int):
-        return jsonable_encoder(self.get_card_by_id(board=board, card_id=card_id))
+        cards = (
+            self.db.query(*CARD_COLUMNS, rank)
+            .filter(Card.status == Status.active)
+            .filter(Card.search_vector.op("@@")(query))
+            .order_by(rank.desc(), Card.id)
+        )
+
+        if board is not None:
+            cards = cards.filter(Card.board_id == board.id)
+        else:
+            member_boards = (
+                select(BoardUser.board_id)
+                .join(Board, Board.id == BoardUser.board_id)
+                .where(BoardUser.user_id == user.id, BoardUser.status == State.approved)
+                .where(Board.status != BoardStatus.deleted)
+            )
+            cards = cards.filter(Card.board_id.in_(member_boards))
+
+        return paginate(self.db, cards, params=params, total_mode=total_mode)
+
+    @staticmethod
+    def get_card_detail(card: Card) -> dict:
+        return to_out(CardOut, card)
 
     def update_card(self, card: Card, update_schema: CardUpdateIn) -> dict:
         unset_fields = update_schema.dict(exclude_unset=True)
+        board_id, card_id = card.board_id, card.id
+        new_state = unset_fields.get("state")
+        state_changed = new_state is not None and new_state != card.state
+
+        card_counts = {card.state: -1, new_state: 1} if state_changed else None
+        card.seq = version = self.bump_board_version(board_id, card_counts=card_counts)
+
+        # A card moved to another state is appended to the end of the state
+        position = None
+        if state_changed:
+            position = rank_between(self._last_position(board_id, new_state), None)
+            card.position = position
 
         for key in unset_fields.keys():
             setattr(card, key, unset_fields.get(key))
 
         self.db.commit()
 
+        publish_board_event(board_id, version, "card.updated", card_id)
+        if position is not None:
+            self._check_positions(board_id, new_state, position)
+
         return {"message": "Kart başarıyla düzenlendi"}
 
     def delete_card(self, card: Card) -> dict:
         card.status = Status.deleted
+        board_id, card_id = card.board_id, card.id
+        card.seq = version = self.bump_board_version(board_id, card_counts={card.state: -1})
         self.db.commit()
 
+        publish_board_event(board_id, version, "card.deleted", card_id)
+
         return {"message": "Kart başarıyla slindi"}
+
+    def _last_position(self, board_id: int, state: CardState, exclude_id: Optional[int] = None) -> Optional[str]:
+        query = self.db.query(Card.position).filter(
+            Card.board_id == board_id, Card.state == state, Card.status == Status.active
+        )
+
+        if exclude_id is not None:
+            query = query.filter(Card.id != exclude_id)
+
+        return query.order_by(Card.position.desc()).limit(1).scalar()
+
+    def _append_positions(self, board_id: int, appended: Dict[CardState, list]) -> Dict[CardState, str]:
+        """
+        Sets the positions of the cards appended to the end of the states, the board must already be locked
+        :param appended: New and updated card mappings grouped by their new states, in order
+        :return: The last position of every state
+        """
+        last_positions = {}
+
+        for state, mappings in appended.items():
+            positions = ranks_between(self._last_position(board_id, state), None, len(mappings))
+            for mapping, position in zip(mappings, positions):
+                mapping["position"] = position
+
+            last_positions[state] = positions[-1]
+
+        return last_positions
+
+    @staticmethod
+    def _schedule_rebalance(board_id: int, state: CardState):
+        try:
+            celery_app.send_task(
+                "rebalance_card_positions", args=(board_id, state.value), retry=False, ignore_result=True
+            )
+        except OperationalError:
+            metrics.incr("card_position.rebalance_schedule_error")
+
+    def _check_positions(self, board_id: int, state: CardState, position: str):
+        """
+        Schedules the rebalancing of the state when the given position has grown too long
+        """
+        if len(position) > settings.CARD_POSITION_MAX_LENGTH:
+            self._schedule_rebalance(board_id, state)
+
+    def move_card(self, card: Card, move_schema: CardMoveIn) -> dict:
+        """
+        This function moves the card to the given place, the state and the position are changed in one update.
+        Only the moved card is written, its new position is chosen between the positions of its new neighbours.
+        :param card: The card to be moved
+        :param move_schema: Target state and the neighbour card, the card is appended to the end of the state without one
+        :return: Message and the new position
+        """
+        board_id, card_id = card.board_id, card.id
+        state = move_schema.state or card.state
+
+        # Taking the board lock first, so the neighbours can not move until the commit
+        card_counts = {card.state: -1, state: 1} if state != card.state else None
+        version = self.bump_board_version(board_id, card_counts=card_counts)
+
+        neighbour_id = move_schema.after_id or move_schema.before_id
+        if neighbour_id is not None:
+            neighbour = (
+                self.db.query(Card.position)
+                .filter(Card.id == neighbour_id, Card.id != card_id, Card.board_id == board_id)
+                .filter(Card.state == state, Card.status == Status.active)
+                .first()
+            )
+
+            if not neighbour:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors.invalid_card_position)
+
+            siblings = self.db.query(Card.position).filter(
+                Card.board_id == board_id, Card.state == state, Card.status == Status.active, Card.id != card_id
+            )
+
+            if move_schema.after_id is not None:
+                lower = neighbour.position
+                upper = (
+                    siblings.filter(Card.position > lower).order_by(Card.position).limit(1).scalar()
+                )  # type: Optional[str]
+            else:
+                upper = neighbour.position
+                lower = siblings.filter(Card.position < upper).order_by(Card.position.desc()).limit(1).scalar()
+        else:
+            lower, upper = self._last_position(board_id, state, exclude_id=card_id), None
+
+        try:
+            position = rank_between(lower, upper)
+        except ValueError:
+            # Equal positions can only be fixed by rebalancing the state
+            self.db.rollback()
+            self._schedule_rebalance(board_id, state)
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=errors.invalid_card_position)
+
+        card.state = state
+        card.position = position
+        card.seq = version
+        self.db.commit()
+
+        publish_board_event(board_id, version, "card.moved", card_id)
+        self._check_positions(board_id, state, position)
+
+        return {"message": "Kart taşındı", "position": position}
+
+    def rebalance_card_positions(self, board_id: int, state: CardState) -> int:
+        """
+        This function rewrites the positions of the active cards of the state with evenly spaced short positions.
+        It is run in the background when a position grows longer than "CARD_POSITION_MAX_LENGTH".
+        :return: Number of the rewritten cards
+        """
+        longest = (
+            self.db.query(func.max(func.length(Card.position)))
+            .filter(Card.board_id == board_id, Card.state == state, Card.status == Status.active)
+            .scalar()
+        )
+
+        if not longest or longest <= settings.CARD_POSITION_MAX_LENGTH:
+            return 0
+
+        version = self.bump_board_version(board_id)
+        card_ids = [
+            card_id
+            for (card_id,) in self.db.query(Card.id)
+            .filter(Card.board_id == board_id, Card.state == state, Card.status == Status.active)
+            .order_by(Card.position, Card.id)
+        ]
+
+        self.db.bulk_update_mappings(
+            Card,
+            [
+                {"id": card_id, "position": position, "seq": version}
+                for card_id, position in zip(card_ids, even_ranks(len(card_ids)))
+            ],
+        )
+        self.db.commit()
+
+        publish_board_event(board_id, version, "card.rebalanced")
+
+        return len(card_ids)
+
+    def get_assignable_user_ids(self, board: Board, user_ids) -> set:
+        """
+        Returns the given user IDs that are active, approved members of the board with a single query
+        """
+        if not user_ids:
+            return set()
+
+        rows = (
+            self.db.query(BoardUser.user_id)
+            .join(User, User.id == BoardUser.user_id)
+            .filter(BoardUser.board_id == board.id)
+            .filter(BoardUser.user_id.in_(user_ids))
+            .filter(BoardUser.status == State.approved)
+            .filter(User.status == Status.active)
+        )
+
+        return {row.user_id for row in rows}
+
+    def bulk_cards(self, board: Board, owner: User, items: List[CardBulkItemIn], atomic: bool = False) -> dict:
+        """
+        This function applies a batch of card operations with a few statements and a single commit.
+        Assignees and cards are validated with one query each, failing items are reported and skipped.
+        :param board: The board of the cards, the membership must already be checked
+        :param owner: The user who creates the new cards
+        :param items: Card operations in the order they are applied
+        :param atomic: If any item fails, none of the items are applied
+        :return: Per-item results in the order of the items
+        """
+        assignee_ids = {
+            item.card.assignment_id for item in items if item.card is not None and item.card.assignment_id is not None
+        }
+        card_ids = {item.card_id for item in items if item.action != CardBulkAction.create}
+
+        assignable_ids = self.get_assignable_user_ids(board=board, user_ids=assignee_ids)
+        card_states = {}
+        if card_ids:
+            card_states = {
+                row.id: row.state
+                for row in self.db.query(Card.id, Card.state)
+                .filter(Card.board_id == board.id)
+                .filter(Card.status == Status.active)
+                .filter(Card.id.in_(card_ids))
+            }
+
+        results = []
+        new_cards, created_results, updates, deleted_ids = [], [], [], []
+        # Created cards and cards moved to another state are appended to the end of the state
+        appended: Dict[CardState, list] = {}
+        card_counts: Counter = Counter()
+
+        for index, item in enumerate(items):
+            result = {"index": index, "action": item.action, "id": item.card_id, "success": True}
+            results.append(result)
+
+            if item.card is not None and item.card.assignment_id is not None:
+                if item.card.assignment_id not in assignable_ids:
+                    result.update(self._bulk_error(errors.user_not_member_the_board))
+                    continue
+
+            if item.action == CardBulkAction.create:
+                values = item.card.dict(include=set(CARD_CREATE_FIELDS))
+                values["state"] = values["state"] or CardState.todo
+                new_cards.append(dict(values, board_id=board.id, owner_id=owner.id))
+                appended.setdefault(values["state"], []).append(new_cards[-1])
+                card_counts[values["state"]] += 1
+                created_results.append(result)
+                continue
+
+            if item.card_id not in card_states:
+                result.update(self._bulk_error(errors.card_not_found))
+                continue
+
+            if item.action == CardBulkAction.delete:
+                card_counts[card_states.pop(item.card_id)] -= 1
+                deleted_ids.append(item.card_id)
+                continue
+
+            values = (
+                dict(item.card.dict(exclude_unset=True), id=item.card_id)
+                if item.action == CardBulkAction.update
+                else {"id": item.card_id, "state": item.state}
+            )
+
+            if values.get("state") is not None and values["state"] != card_states[item.card_id]:
+                card_counts[card_states[item.card_id]] -= 1
+                card_counts[values["state"]] += 1
+                card_states[item.card_id] = values["state"]
+                appended.setdefault(values["state"], []).append(values)
+
+            if len(values) > 1:
+                updates.append(values)
+
+        if atomic and not all(result["success"] for result in results):
+            for result in results:
+                result["success"] = False
+
+            return {"items": results}
+
+        if not (new_cards or updates or deleted_ids):
+            return {"items": results}
+
+        board_id = board.id
+        seq = self.bump_board_version(board_id, card_counts=card_counts)
+
+        last_positions = self._append_positions(board_id=board_id, appended=appended)
+
+        if new_cards:
+            created_ids = (
+                self.db.execute(insert(Card).values([dict(card, seq=seq) for card in new_cards]).returning(Card.id))
+                .scalars()
+                .all()
+            )
+
+            for result, card_id in zip(created_results, created_ids):
+                result["id"] = card_id
+
+        if updates:
+            self.db.bulk_update_mappings(Card, [dict(mapping, seq=seq) for mapping in updates])
+
+        if deleted_ids:
+            self.db.execute(update(Card).where(Card.id.in_(deleted_ids)).values(status=Status.deleted, seq=seq))
+
+        self.db.commit()
+
+        changed_ids = {result["id"] for result in results if result["success"]}
+        publish_board_event(board_id, seq, "card.bulk", *changed_ids)
+
+        for state, position in last_positions.items():
+            self._check_positions(board_id, state, position)
+
+        return {"items": results}
+
+    @staticmethod
+    def _bulk_error(error: errors) -> dict:
+        return {"success": False, "error_code": error.value, "error_message": error.phrase}
+
+    # Comment Functions
+    def create_comment(self, card: Card, user: User, create_schema: CommentIn) -> dict:
+        board_id, card_id = card.board_id, card.id
+        version = self.bump_board_version(board_id)
+
+        comment = Comment()
+        comment.card_id = card_id
+        comment.user_id = user.id
+        comment.content = create_schema.content
+        self.db.add(comment)
+
+        # Incremented in SQL, the listings read the count without counting the comments
+        card.comment_count = Card.comment_count + 1
+        card.seq = version
+        self.db.flush()
+        comment_id = comment.id
+        self.db.commit()
+
+        publish_board_event(board_id, version, "comment.created", card_id)
+
+        return {"message": "Yorum başarıyla oluşturuldu", "id": comment_id}
+
+    def get_comments(self, card: Card, cursor_params: CursorParams) -> dict:
+        """
+        Returns the active comments of the card oldest first, each page is a range scan of the (card_id, id) index
+        """
+        comments = (
+            self.db.query(Comment)
+            .join(User, Comment.user_id == User.id)
+            .filter(Comment.card_id == card.id, Comment.status == Status.active)
+            .with_entities(
+                Comment.id,
+                Comment.date_created,
+                Comment.date_modified,
+                Comment.user_id,
+                User.full_name,
+                Comment.content,
+            )
+        )
+
+        return cursor_paginate(comments, key_columns=[Comment.id], params=cursor_params)
+
+    def delete_comment(self, context: BoardContext, comment_id: int, user: User) -> dict:
+        """
+        The comment can be deleted by the user who wrote it or by the owners of the board
+        """
+        card = context.card
+        comment = (
+            self.db.query(Comment)
+            .filter(Comment.id == comment_id, Comment.card_id == card.id, Comment.status == Status.active)
+            .first()
+        )
+
+        if not comment:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.comment_not_found)
+
+        if comment.user_id != user.id and context.role != UserRoleType.owner:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=errors.user_not_owner_the_comment)
+
+        board_id, card_id = card.board_id, card.id
+        version = self.bump_board_version(board_id)
+
+        comment.status = Status.deleted
+        card.comment_count = Card.comment_count - 1
+        card.seq = version
+        self.db.commit()
+
+        publish_board_event(board_id, version, "comment.deleted", card_id)
+
+        return {"message": "Yorum başarıyla silindi"}
+
+    # Maintenance Functions
+    def reconcile_card_counts(self, batch_size: int = settings.BOARD_COUNTS_RECONCILE_BATCH_SIZE) -> int:
+        """
+        This function recounts the active cards of every board and fixes the counters that drifted
+        (e.g. after a manual change in the database). The boards are locked in batches of "batch_size",
+        so the card writes of a batch wait until it is committed and no change is lost.
+        :return: Number of the fixed boards
+        """
+        fixed, last_id = 0, 0
+
+        while True:
+            board_ids = [
+                board_id
+                for (board_id,) in self.db.query(Board.id)
+                .filter(Board.id > last_id)
+                .order_by(Board.id)
+                .limit(batch_size)
+                .with_for_update()
+            ]
+
+            if not board_ids:
+                return fixed
+
+            stats = (
+                select(
+                    Board.id,
+                    *[func.count(Card.id).filter(Card.state == state).label(state.value) for state in CardState],
+                )
+                .outerjoin(Card, and_(Card.board_id == Board.id, Card.status == Status.active))
+                .where(Board.id.in_(board_ids))
+                .group_by(Board.id)
+                .subquery()
+            )
+
+            # The version is bumped, so the cached listings and snapshots with the old counts are not served
+            versions = self.db.execute(
+                update(Board)
+                .where(Board.id == stats.c.id)
+                .where(or_(*[column != stats.c[state.value] for state, column in CARD_COUNT_COLUMNS.items()]))
+                .values(
+                    version=Board.version + 1,
+                    date_modified=Board.date_modified,
+                    **{column.key: stats.c[state.value] for state, column in CARD_COUNT_COLUMNS.items()},
+                )
+                .returning(Board.id, Board.version)
+                .execution_options(synchronize_session=False)
+            ).all()
+            self.db.commit()
+
+            for board_id, version in versions:
+                publish_board_event(board_id, version, "board.recounted")
+
+            fixed += len(versions)
+            last_id = board_ids[-1]
+
+    def _purge_batches(self, model, conditions: list, delete_rows: Callable[[List[int]], int], batch_size: int) -> int:
+        """
+        Deletes the rows matching the conditions in ID order, one short transaction per batch
+        :param model: Model of the purged rows
+        :param conditions: Filters of the purged rows
+        :param delete_rows: Deletes the rows of the given IDs (and their dependents), returns the deleted row count
+        :param batch_size: Rows per transaction
+        :return: Number of the deleted rows
+        """
+        purged, last_id = 0, 0
+
+        while True:
+            ids = [
+                row_id
+                for (row_id,) in self.db.query(model.id)
+                .filter(*conditions, model.id > last_id)
+                .order_by(model.id)
+                .limit(batch_size)
+            ]
+
+            if not ids:
+                return purged
+
+            count = delete_rows(ids)
+            self.db.commit()
+
+            purged += count
+            metrics.incr("purge.{}".format(model.__tablename__), count)
+            last_id = ids[-1]
+
+            # Throttling, so that a long purge leaves room for the requests
+            sleep(settings.PURGE_BATCH_PAUSE)
+
+    def _delete_comments(self, comment_ids: List[int]) -> int:
+        return self.db.execute(delete(Comment).where(Comment.id.in_(comment_ids))).rowcount
+
+    def _delete_cards(self, card_ids: List[int]) -> int:
+        self.db.execute(delete(Comment).where(Comment.card_id.in_(card_ids)))
+        rows = self.db.execute(delete(Card).where(Card.id.in_(card_ids)).returning(Card.board_id, Card.seq)).all()
+
+        # The change feed resets the clients whose cursor is older than the purged cards
+        purged_seqs: Dict[int, int] = {}
+        for board_id, seq in rows:
+            purged_seqs[board_id] = max(seq, purged_seqs.get(board_id, 0))
+
+        for board_id, seq in sorted(purged_seqs.items()):
+            self.db.execute(
+                update(Board)
+                .where(Board.id == board_id)
+                .values(purged_seq=func.greatest(Board.purged_seq, seq), date_modified=Board.date_modified)
+                .execution_options(synchronize_session=False)
+            )
+
+        return len(rows)
+
+    def _delete_boards(self, board_ids: List[int]) -> int:
+        for board_id in board_ids:
+            self._purge_batches(Card, [Card.board_id == board_id], self._delete_cards, settings.PURGE_BATCH_SIZE)
+
+        self.db.execute(delete(BoardUser).where(BoardUser.board_id.in_(board_ids)))
+
+        return self.db.execute(delete(Board).where(Board.id.in_(board_ids))).rowcount
+
+    def purge_deleted(self, before: datetime, batch_size: int = settings.PURGE_BATCH_SIZE) -> Dict[str, int]:
+        """
+        This function hard deletes the boards, cards and comments that were soft deleted before the given date.
+        The rows are deleted in small ID ordered batches with a commit and a pause after each,
+        so the purge can run next to the requests without holding long locks.
+        :param before: Rows deleted before this date are purged
+        :param batch_size: Rows per transaction, the cards of a purged board are deleted with the same batch size
+        :return: Number of the purged boards, cards and comments, the cards of the purged boards are not counted
+        """
+        comments = self._purge_batches(
+            Comment,
+            [Comment.status == Status.deleted, Comment.date_modified < before],
+            self._delete_comments,
+            batch_size,
+        )
+        cards = self._purge_batches(
+            Card, [Card.status == Status.deleted, Card.date_modified < before], self._delete_cards, batch_size
+        )
+        boards = self._purge_batches(
+            Board,
+            [Board.status == BoardStatus.deleted, Board.date_modified < before],
+            self._delete_boards,
+            batch_size=1,
+        )
+
+        return {"boards": boards, "cards": cards, "comments": comments}
+
+
+class AsyncBoardCore:
+    """
+    Async variants of the BoardCore reads for the async routes. They build the same queries as BoardCore
+    and share its caches, the writes stay in BoardCore.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_board_context(
+        self, board_id: int, user: User, role=None, board_status=None, card_id: Optional[int] = None
+    ) -> BoardContext:
+        key = _member_cache_key(board_id, user.id)
+        membership = member_cache.get(key)
+
+        row = (await self.db.execute(_board_context_query(board_id, user, board_status, card_id, membership))).first()
+
+        return _board_context_from_row(row, key, membership, role, card_id, cache=is_primary(self.db))
+
+    async def get_all_boards(
+        self,
+        user: User,
+        search: str = None,
+        role: UserRoleType = None,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.exact,
+        cursor_params: Optional[CursorParams] = None,
+        counts: bool = False,
+    ):
+        boards = (
+            select(*_board_list_columns(counts))
+            .join(BoardUser, BoardUser.board_id == Board.id)
+            .where(*_board_list_filters(user, search, role))
+        )
+
+        if cursor_params is not None:
+            return await async_cursor_paginate(self.db, boards, key_columns=[Board.id], params=cursor_params)
+
+        return await async_paginate(self.db, boards.order_by(Board.id), params=params, total_mode=total_mode)
+
+    async def get_all_cards(
+        self,
+        board: Board,
+        filters: Optional[CardFilterParams] = None,
+        order_by: CardOrderBy = CardOrderBy.id,
+        params: Params = Params(),
+        total_mode: TotalMode = TotalMode.exact,
+        cursor_params: Optional[CursorParams] = None,
+    ):
+        cards = select(*CARD_COLUMNS).where(Card.board_id == board.id, Card.status == Status.active)
+
+        if filters is not None:
+            cards = BoardCore._filter_cards(cards, filters)
+
+        if cursor_params is not None:
+            return await async_cursor_paginate(self.db, cards, key_columns=[Card.id], params=cursor_params)
+
+        return await async_paginate(
+            self.db,
+            BoardCore._order_cards(cards, order_by),
+            params=params,
+            total_mode=total_mode,
+            known_total=BoardCore._counted_total(board, filters),
+        )
@@ -1,77 +1,109 @@
 from datetime import datetime
+from typing import Iterator, List
 
-from app.helpers.email_helper import send_template_mail
+from fastapi import HTTPException, status
+from kombu.exceptions import OperationalError
+from sqlalchemy import select, tuple_
+
+from app.helpers.email_helper import send_template_email
+from app.helpers.error_helper import ErrorCode as errors
 from app.models.board import Board, Card
+from app.models.enums import Status
 from app.models.enums.board import BoardStatus, CardState
 from app.models.user import User
+from app.worker import celery_app
+from settings import settings
 
 
 class TaskCore:
     def __init__(self, db):
         self.db = db
 
-    def card_start_reminder(self):
-        now = datetime.now()
-        check_cards = (
-            self.db.query(Card)
+    @staticmethod
+    def start_job(name: str) -> dict:
+        """
+        This function queues the given Celery task and returns without waiting for it
+        :param name: Name of the task
+        :return: Message and the job ID, the job can be followed with get_job
+        """
+        try:
+            result = celery_app.send_task(name, retry=False)
+        except OperationalError:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=errors.task_queue_unavailable)
+
+        return {"message": "İşlem başlatıldı", "job_id": result.id}
+
+    @staticmethod
+    def get_job(job_id: str) -> dict:
+        result = celery_app.AsyncResult(job_id)
+        return {"job_id": job_id, "status": result.status, "result": result.result if result.successful() else None}
+
+    def _due_cards(self, date_column, *conditions, batch_size: int) -> Iterator[List]:
+        """
+        Yields the due cards of the active boards in (date, ID) ordered keyset batches. Each batch is a
+        short query served by the partial reminder index, so the memory does not grow with the number of cards.
+        """
+        query = (
+            select(Card.id, date_column.label("date"), Card.title, Board.name, User.email, User.full_name)
             .join(Board, Card.board_id == Board.id)
             .join(User, Card.owner_id == User.id)
-            .filter(Board.status == BoardStatus.active)
-            .filter(Card.estimated_start <= now, Card.state == CardState.todo)
-            .with_entities(
-                User.email,
-                User.full_name,
-                Card.title,
-                Board.name,
-                Card.estimated_start,
-            )
-            .all()  # TODO:  use iterator
+            .where(Board.status == BoardStatus.active, Card.status == Status.active, date_column <= datetime.now())
+            .where(*conditions)
+            .order_by(date_column, Card.id)
+            .limit(batch_size)
         )
 
-        for card in check_cards:
-            send_template_mail(
-                template_path="card_start_reminder.html",
-                template_vars={
-                    "full_name": card.full_name,
-                    "board_name": card.name,
-                    "card_title": card.title,
-                    "estimated_start": card.estimated_start,
-                },
-                subject="Hatırlatma",
-                receivers=card.email,
-            )
-
-        return {"message": "İşlem tamamlandı"}
-
-    def card_finish_reminder(self):
-        now = datetime.now()
-        check_cards = (
-            self.db.query(Card)
-            .join(Board, Card.board_id == Board.id)
-            .join(User, Card.owner_id == User.id)
-            .filter(Board.status == BoardStatus.active)
-            .filter(Card.estimated_finish <= now, Card.state != CardState.done)
-            .with_entities(
-                User.email,
-                User.full_name,
-                Card.title,
-                Board.name,
-                Card.estimated_finish,
-            )
-            .all()
+        cards = self.db.execute(query).all()
+        while cards:
+            yield cards
+
+            if len(cards) < batch_size:
+                return
+
+            last = cards[-1]
+            cards = self.db.execute(query.where(tuple_(date_column, Card.id) > (last.date, last.id))).all()
+
+    def _send_reminders(self, template_path: str, date_name: str, date_column, *conditions, batch_size: int) -> int:
+        """
+        Hands the reminder mails of the due cards to the workers, a chunk of mails per task
+        :return: Number of the reminded cards
+        """
+        count = 0
+
+        for cards in self._due_cards(date_column, *conditions, batch_size=batch_size):
+            mails = [
+                (
+                    template_path,
+                    {
+                        "full_name": card.full_name,
+                        "board_name": card.name,
+                        "card_title": card.title,
+                        date_name: str(card.date),
+                    },
+                    "Hatırlatma",
+                    card.email,
+                )
+                for card in cards
+            ]
+            send_template_email.chunks(mails, settings.REMINDER_MAIL_CHUNK_SIZE).apply_async()
+            count += len(cards)
+
+        return count
+
+    def card_start_reminder(self, batch_size: int = settings.REMINDER_BATCH_SIZE) -> int:
+        return self._send_reminders(
+            "card_start_reminder.html",
+            "estimated_start",
+            Card.estimated_start,
+            Card.state == CardState.todo,
+            batch_size=batch_size,
         )
 
-        for card in check_cards:
-            send_template_mail(
-                template_path="card_finish_reminder.html",
-                template_vars={
-                    "full_name": card.full_name,
-                    "board_name": card.name,
-                    "card_title": card.title,
-                    "estimated_finish": card.estimated_finish,
-                },
-                subject="Hatırlatma",
-                receivers=card.email,
-            )
-
-        return {"message": "İşlem tamamlandı"}
+    def card_finish_reminder(self, batch_size: int = settings.REMINDER_BATCH_SIZE) -> int:
+        return self._send_reminders(
+            "card_finish_reminder.html",
+            "estimated_finish",
+            Card.estimated_finish,
+            Card.state != CardState.done,
+            batch_size=batch_size,
+        )
@@ -3,15 +3,59 @@ from datetime import datetime, timedelta
 from fastapi import HTTPException, status
 from fastapi.encoders import jsonable_encoder
 from pydantic import EmailStr
+from sqlalchemy import func, select
+from sqlalchemy.orm import make_transient_to_detached
 
+from app.api.v1.schemas.user import UserDetailOut
+from app.db.database import is_primary
+from app.helpers.cache_helper import TieredCache
 from app.helpers.email_helper import send_template_mail
 from app.helpers.error_helper import ErrorCode as errors
 from app.helpers.hash_helper import HashHelper
+from app.helpers.response_helper import to_out
 from app.helpers.string_helper import generate_verification_code
 from app.models.enums import Status
 from app.models.user import User
 from settings import settings
 
+user_cache = TieredCache(
+    "user", max_size=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL, local_only_ttl=settings.CACHE_LOCAL_ONLY_TTL
+)
+
+# Secrets (password hash, verification codes) are never cached, they are lazy loaded when accessed.
+CACHED_USER_FIELDS = (
+    "id",
+    "date_created",
+    "date_modified",
+    "first_name",
+    "last_name",
+    "full_name",
+    "email",
+    "email_verification",
+    "email_verification_date",
+    "status",
+    "token_version",
+)
+CACHED_USER_DATE_FIELDS = ("date_created", "date_modified", "email_verification_date")
+
+
+def _user_to_cache(user: User) -> dict:
+    return jsonable_encoder({field: getattr(user, field) for field in CACHED_USER_FIELDS})
+
+
+def _user_from_cache(data: dict) -> User:
+    values = dict(data)
+    values["status"] = Status(values["status"])
+
+    for field in CACHED_USER_DATE_FIELDS:
+        if values[field] is not None:
+            values[field] = datetime.fromisoformat(values[field])
+
+    user = User(**values)
+    make_transient_to_detached(user)
+
+    return user
+
 
 class UserCore:
     def __init__(self, db):
@@ -39,13 +83,42 @@ class UserCore:
         if user_status is None:
             user_status = [Status.active]
 
-        user = self.db.query(User).filter(User.email == email, User.status.in_(user_status)).first()
+        user = self.db.query(User).filter(func.lower(User.email) == email.lower(), User.status.in_(user_status)).first()
 
         if not user and show_error:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.user_not_found)
 
         return user
 
+    def get_cached_user_by_id(self, user_id: int, user_status=None) -> User:
+        """
+        This function works like get_user_by_id but serves the user from the user cache when possible
+        :param user_id: ID number of the user (the token subject)
+        :param user_status: Allows searching by user's status (default: Active)
+        :return: User Object attached to the current session
+        """
+        if user_status is None:
+            user_status = [Status.active]
+
+        data = user_cache.get(user_id)
+
+        if data is None:
+            user = self.get_user_by_id(user_id=user_id, user_status=[Status.active, Status.passive], show_error=False)
+
+            if user and is_primary(self.db):
+                user_cache.set(user_id, _user_to_cache(user))
+        else:
+            user = self.db.merge(_user_from_cache(data), load=False)
+
+        if not user or user.status not in user_status:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.user_not_found)
+
+        return user
+
+    @staticmethod
+    def invalidate_user_cache(user_id: int):
+        user_cache.delete(user_id)
+
     def get_user_by_id(self, user_id: int, user_status=None, show_error: bool = True) -> User:
         if user_status is None:
             user_status = [Status.active]
@@ -100,17 +173,81 @@ class UserCore:
 
     @staticmethod
     def get_user_detail(user: User):
-        return jsonable_encoder(user)
+        return to_out(UserDetailOut, user)
 
     def verify_email(self, user: User) -> dict:
         user.email_verification = True
         user.email_verification_date = datetime.now()
+        user_id = user.id
         self.db.commit()
 
+        self.invalidate_user_cache(user_id)
+
         return {"message": "Kullanıcı e-posta adresi doğrulandı."}
 
     def reset_user_password(self, user: User, new_password: str) -> dict:
         user.password_hash = self.hash_helper.get_password_hash(new_password)
+        user.token_version = (
+            User.token_version + 1
+        )  # Sign out all sessions, incremented in SQL so concurrent bumps are not lost
+        user_id = user.id
         self.db.commit()
 
+        self.invalidate_user_cache(user_id)
+
         return {"message": "Kullanıcı şifresi güncelledi."}
+
+    def revoke_user_tokens(self, user: User) -> dict:
+        """
+        Invalidates every access token issued to the user by bumping the token version
+        """
+        user.token_version = User.token_version + 1
+        user_id = user.id
+        self.db.commit()
+
+        self.invalidate_user_cache(user_id)
+
+        return {"message": "Kullanıcının tüm oturumları sonlandırıldı."}
+
+
+class AsyncUserCore:
+    """
+    Async variants of the UserCore reads for the async routes, they share the user cache with UserCore
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_user_by_id(self, user_id: int, user_status=None, show_error: bool = True) -> User:
+        if user_status is None:
+            user_status = [Status.active]
+
+        user = (
+            await self.db.execute(select(User).where(User.id == user_id, User.status.in_(user_status)).limit(1))
+        ).scalar()
+
+        if not user and show_error:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.user_not_found)
+
+        return user
+
+    async def get_cached_user_by_id(self, user_id: int, user_status=None) -> User:
+        if user_status is None:
+            user_status = [Status.active]
+
+        data = user_cache.get(user_id)
+
+        if data is None:
+            user = await self.get_user_by_id(
+                user_id=user_id, user_status=[Status.active, Status.passive], show_error=False
+            )
+
+            if user and is_primary(self.db):
+                user_cache.set(user_id, _user_to_cache(user))
+        else:
+            user = await self.db.merge(_user_from_cache(data), load=False)
+
+        if not user or user.status not in user_status:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=errors.user_not_found)
+
+        return user
@@ -1,16 +1,22 @@
 from typing import Any
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
+from app.db.pool import AsyncInstrumentedQueuePool, instrument_pool, pool_options
 from settings import settings
 
+# Timestamps are read in UTC, asyncpg always returns them in UTC
+CONNECT_ARGS = {"options": "-c timezone=UTC"}
+
 engine = create_engine(
     settings.SQLALCHEMY_DATABASE_URI,
-    pool_size=20,
-    pool_recycle=60,
-    pool_pre_ping=True,
+    **pool_options("db.pool"),
+    connect_args=CONNECT_ARGS,
+    executemany_mode="values_plus_batch",  # Sends executemany INSERT/UPDATE statements in pages, not row by row
 )
 
 SessionLocal = sessionmaker(
@@ -19,9 +25,35 @@ SessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# Engine of the async routes, it uses the same database through asyncpg
+async_engine = create_async_engine(
+    settings.SQLALCHEMY_ASYNC_DATABASE_URI
+    or make_url(settings.SQLALCHEMY_DATABASE_URI).set(drivername="postgresql+asyncpg"),
+    **pool_options("db.async_pool", AsyncInstrumentedQueuePool),
+)
+
+instrument_pool("db.pool", engine)
+instrument_pool("db.async_pool", async_engine.sync_engine)
+
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 Base = declarative_base()  # type: Any
 
 
+def is_primary(db) -> bool:
+    """
+    Returns whether the sync or async session reads from the primary. The rows read from a replica may be stale,
+    so they must not be written to the shared caches.
+    """
+    return db.bind is engine or db.bind is async_engine
+
+
 def init_db() -> None:
     Base.metadata.create_all(engine)
 
@@ -32,3 +64,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
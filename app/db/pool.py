@@ -0,0 +1,70 @@
+from time import perf_counter
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.helpers.metrics_helper import metrics
+from settings import settings
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that times every checkout, including the wait for a free connection and opening a new one
+    """
+
+    metrics_name = "db.pool"
+
+    def _do_get(self):
+        start = perf_counter()
+
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.incr(self.metrics_name + ".timeout")
+            raise
+        finally:
+            metrics.observe(self.metrics_name + ".checkout_wait", perf_counter() - start)
+
+
+class AsyncInstrumentedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    metrics_name = "db.async_pool"
+
+
+def _count(name: str):
+    def listener(*args):
+        metrics.incr(name)
+
+    return listener
+
+
+def pool_options(name: str, pool_class: type = InstrumentedQueuePool) -> dict:
+    """
+    Returns the engine arguments of a pool configured by the settings
+    :param name: Prefix of the pool metrics (e.g. db.pool)
+    :param pool_class: InstrumentedQueuePool or AsyncInstrumentedQueuePool
+    :return: Keyword arguments of create_engine
+    """
+    return {
+        # A subclass per engine, the class is kept when the engine is disposed and its pool is recreated
+        "poolclass": type(pool_class.__name__, (pool_class,), {"metrics_name": name}),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
+def instrument_pool(name: str, engine: Engine):
+    """
+    Counts the opened, closed (also recycled) and invalidated connections of the engine and exports
+    its connection counts. The pool is read on every snapshot, since it is replaced when the engine is disposed.
+    """
+    event.listen(engine, "connect", _count(name + ".connect"))
+    event.listen(engine, "close", _count(name + ".close"))
+    event.listen(engine, "invalidate", _count(name + ".invalidate"))
+
+    metrics.gauge(name + ".checked_out", lambda: engine.pool.checkedout())
+    metrics.gauge(name + ".idle", lambda: engine.pool.checkedin())
+    metrics.gauge(name + ".overflow", lambda: max(engine.pool.overflow(), 0))
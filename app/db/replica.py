@@ -0,0 +1,149 @@
+from itertools import count
+from threading import Lock, Thread
+from time import sleep, time
+from typing import List, Optional
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.db.database import CONNECT_ARGS
+from app.db.pool import AsyncInstrumentedQueuePool, instrument_pool, pool_options
+from app.helpers.cache_helper import TieredCache
+from app.helpers.metrics_helper import metrics
+from settings import settings
+
+# Seconds behind the primary, 0 when the replica has replayed everything it received or it is not in recovery
+LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Users who wrote recently, their reads go to the primary until the entry expires
+recent_writers = TieredCache(
+    "recent_writer", max_size=settings.USER_CACHE_SIZE, ttl=settings.REPLICA_READ_YOUR_WRITES_WINDOW
+)
+
+
+class Replica:
+    """
+    Sync and async engines of a read replica. A replica is used only after a successful health check
+    and until a check or a connection error marks it unhealthy.
+    """
+
+    def __init__(self, index: int, url: str):
+        name = "db.replica_{}".format(index)
+
+        self.name = name
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.failed_at = 0.0
+        self.engine = create_engine(url, **pool_options(name + ".pool"), connect_args=CONNECT_ARGS)
+        self.async_engine = create_async_engine(
+            make_url(url).set(drivername="postgresql+asyncpg"),
+            **pool_options(name + ".async_pool", AsyncInstrumentedQueuePool),
+        )
+
+        instrument_pool(name + ".pool", self.engine)
+        instrument_pool(name + ".async_pool", self.async_engine.sync_engine)
+        for engine in (self.engine, self.async_engine.sync_engine):
+            event.listen(engine, "handle_error", self._handle_error)
+            event.listen(engine, "checkout", self._checkout)
+
+        metrics.gauge(name + ".healthy", lambda: int(self.healthy))
+        metrics.gauge(name + ".lag", lambda: self.lag)
+
+    def _failed(self):
+        self.healthy = False
+        self.failed_at = time()
+        metrics.incr(self.name + ".connection_error")
+
+    def _handle_error(self, context):
+        # The requests that are already running fail, the next ones go to the other replicas or the primary
+        if context.is_disconnect or context.connection is None:
+            self._failed()
+
+    def _checkout(self, dbapi_connection, connection_record, connection_proxy):
+        # Pooled connections opened before a failure may be closed by a restarted replica, the pool replaces them
+        if connection_record.starttime < self.failed_at:
+            raise DisconnectionError()
+
+    def check(self):
+        try:
+            with self.engine.connect() as connection:
+                self.lag = float(connection.execute(LAG_QUERY).scalar())
+        except SQLAlchemyError:
+            self.lag = None
+            self._failed()
+
+        self.healthy = self.lag is not None and self.lag <= settings.REPLICA_MAX_LAG
+
+
+replicas: List[Replica] = [Replica(index, url) for index, url in enumerate(settings.SQLALCHEMY_REPLICA_URIS)]
+
+_counter = count()
+_checker: Optional[Thread] = None
+_checker_lock = Lock()
+
+
+def _check_replicas():
+    while True:
+        for replica in replicas:
+            replica.check()
+
+        sleep(settings.REPLICA_HEALTH_CHECK_INTERVAL)
+
+
+def _start_checker():
+    """
+    Starts the health checks of the current process on the first read. The replicas are unhealthy until
+    their first check, so the reads go to the primary in the meantime.
+    """
+    global _checker
+
+    with _checker_lock:
+        if _checker is None:
+            _checker = Thread(target=_check_replicas, name="replica-health-check", daemon=True)
+            _checker.start()
+
+
+def mark_write(user_id: int):
+    """
+    Starts the read-your-writes window of the user, it must be called after the write is committed
+    """
+    if replicas:
+        recent_writers.set(user_id, True)
+
+
+def choose_replica(user_id: Optional[int] = None) -> Optional[Replica]:
+    """
+    Returns a healthy replica in turn, or None when the read must go to the primary: no replica is configured
+    or healthy, or the user is in the read-your-writes window.
+    :param user_id: ID number of the current user, None for anonymous reads
+    """
+    if not replicas:
+        return None
+
+    _start_checker()
+
+    if user_id is not None and recent_writers.get(user_id):
+        metrics.incr("db.replica.read_your_writes")
+        return None
+
+    healthy = [replica for replica in replicas if replica.healthy]
+    if not healthy:
+        metrics.incr("db.replica.fallback")
+        return None
+
+    return healthy[next(_counter) % len(healthy)]
+
+
+def read_engine(user_id: Optional[int] = None) -> Optional[Engine]:
+    replica = choose_replica(user_id)
+    return replica.engine if replica is not None else None
+
+
+def async_read_engine(user_id: Optional[int] = None) -> Optional[AsyncEngine]:
+    replica = choose_replica(user_id)
+    return replica.async_engine if replica is not None else None
@@ -0,0 +1,186 @@
+import json
+from collections import OrderedDict
+from threading import Lock, Thread
+from time import monotonic, sleep
+from typing import Any, Dict, Optional
+
+from redis import Redis, RedisError
+
+from app.helpers.metrics_helper import metrics
+from settings import settings
+
+INVALIDATION_CHANNEL = "coyote:cache:invalidate"
+
+_MISSING = object()
+_redis_client: Optional[Redis] = None
+_redis_client_lock = Lock()
+_caches: Dict[str, "TieredCache"] = {}
+
+
+def get_redis_client() -> Optional[Redis]:
+    """
+    Returns the shared Redis client of the cache tier, or None when "CACHE_REDIS_URL" is not configured.
+    The first call also starts the invalidation listener of the current process.
+    """
+    global _redis_client
+
+    if not settings.CACHE_REDIS_URL:
+        return None
+
+    with _redis_client_lock:
+        if _redis_client is None:
+            _redis_client = Redis.from_url(settings.CACHE_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+            Thread(target=_listen_invalidations, name="cache-invalidation", daemon=True).start()
+
+    return _redis_client
+
+
+def _listen_invalidations():
+    """
+    Evicts the keys invalidated by other API workers from the in-process tier. The local tiers are
+    cleared after a connection loss because invalidations may have been missed in the meantime.
+    """
+    client = Redis.from_url(settings.CACHE_REDIS_URL)
+
+    while True:
+        try:
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+
+            for message in pubsub.listen():
+                data = json.loads(message["data"])
+                cache = _caches.get(data["cache"])
+
+                if cache is not None:
+                    for key in data["keys"]:
+                        cache.local.delete(key)
+        except RedisError:
+            metrics.incr("cache.invalidation_listener_error")
+
+            for cache in _caches.values():
+                cache.local.clear()
+
+            sleep(1)
+
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after "ttl" seconds
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+
+            if item is _MISSING:
+                return default
+
+            expire, value = item
+            if expire < monotonic():
+                del self._data[key]
+                return default
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        expire = monotonic() + (self.ttl if ttl is None else ttl)
+
+        with self._lock:
+            self._data[key] = (expire, value)
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """
+    In-process TTL/LRU cache with an optional Redis tier shared by all API workers.
+    Keys and values must be JSON serializable so they can be stored in Redis and published to other workers.
+    Hit and miss counters are published as "<name>_cache.*" metrics.
+    Without Redis the invalidations do not reach the other workers, so the caches given a "local_only_ttl"
+    keep their entries at most that many seconds.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: int, local_only_ttl: Optional[int] = None):
+        self.name = name
+        self.ttl = ttl
+        if local_only_ttl is not None and not settings.CACHE_REDIS_URL:
+            ttl = min(ttl, local_only_ttl)
+
+        self.local = TTLCache(max_size=max_size, ttl=ttl)
+
+        _caches[name] = self
+
+        metrics.gauge("{}_cache.size".format(name), lambda: len(self.local))
+
+    def _redis_key(self, key) -> str:
+        return "coyote:cache:{}:{}".format(self.name, key)
+
+    def get(self, key) -> Any:
+        value = self.local.get(key, _MISSING)
+
+        if value is not _MISSING:
+            metrics.incr("{}_cache.hit".format(self.name))
+            return value
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self._redis_key(key))
+            except RedisError:
+                raw = None
+
+            if raw is not None:
+                value = json.loads(raw)
+                self.local.set(key, value)
+                metrics.incr("{}_cache.redis_hit".format(self.name))
+                return value
+
+        metrics.incr("{}_cache.miss".format(self.name))
+        return None
+
+    def set(self, key, value):
+        self.local.set(key, value)
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.setex(self._redis_key(key), self.ttl, json.dumps(value))
+            except RedisError:
+                pass
+
+    def delete(self, *keys):
+        if not keys:
+            return
+
+        for key in keys:
+            self.local.delete(key)
+
+        client = get_redis_client()
+        if client is not None:
+            try:
+                client.delete(*[self._redis_key(key) for key in keys])
+                client.publish(INVALIDATION_CHANNEL, json.dumps({"cache": self.name, "keys": list(keys)}))
+            except RedisError:
+                pass
+
+        metrics.incr("{}_cache.invalidation".format(self.name), len(keys))
@@ -7,6 +7,9 @@ from jinja2 import Environment, PackageLoader
 from app.worker import celery_app
 from settings import settings
 
+# Templates are compiled once and cached by the environment
+env = Environment(loader=PackageLoader("app", "templates/email"), autoescape=True)
+
 
 @celery_app.task(name="send_email")
 def send_mail(subject, receivers, body):
@@ -34,10 +37,20 @@ def send_mail(subject, receivers, body):
         return False
 
 
+def render_template(template_path: str, template_vars: dict) -> str:
+    return env.get_template(template_path).render(**template_vars)
+
+
 def send_template_mail(template_path: str, template_vars: dict, subject: str, receivers: str):
-    env = Environment(loader=PackageLoader("app", "templates/email"), autoescape=True)
-    template = env.get_template(template_path)
-    html = template.render(**template_vars)
+    html = render_template(template_path, template_vars)
     send_mail.delay(subject, receivers, html)
 
     return True
+
+
+@celery_app.task(name="send_template_email", ignore_result=True)
+def send_template_email(template_path: str, template_vars: dict, subject: str, receivers: str):
+    """
+    Renders and sends the mail in the worker, used for the batches whose rendering should not block the sender
+    """
+    return send_mail(subject, receivers, render_template(template_path, template_vars))
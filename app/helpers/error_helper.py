@@ -15,6 +15,9 @@ class ErrorCode(IntEnum):
     invalid_access_token = 10001, "Geçersiz erişim tokeni."
     invalid_access_session = 10002, "Geçersiz oturum."
     invalid_permission = 10003, "Yetkisiz işlem."
+    hash_pool_busy = 10004, "Sunucu yoğun, lütfen daha sonra tekrar deneyin."
+    invalid_cursor = 10005, "Geçersiz sayfalama imleci."
+    task_queue_unavailable = 10006, "Görev kuyruğuna ulaşılamıyor, lütfen daha sonra tekrar deneyin."
 
     # Auth Errors
     invalid_email_verification_exp_date = 10100, "E-mail doğrulama süresi geçerli değil."
@@ -34,3 +37,6 @@ class ErrorCode(IntEnum):
     board_already_deleted = 10305, "Pano zaten silinmiş."
     user_already_exists_in_board = 10306, "Kullanıcı zaten pano üyesi."
     card_not_found = 10307, "Kart bulunamadı"
+    invalid_card_position = 10308, "Geçersiz kart konumu."
+    comment_not_found = 10309, "Yorum bulunamadı."
+    user_not_owner_the_comment = 10310, "Kullanıcı yorumun sahibi değil."
@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from hashlib import md5
+from typing import Optional
+
+from fastapi import Request, Response, status
+from pytz import timezone as pytz_timezone
+
+from app.helpers.metrics_helper import metrics
+from settings import settings
+
+
+def make_etag(*parts) -> str:
+    """
+    Builds a weak ETag from the given version parts (e.g. board ID, board version, query string)
+    """
+    return 'W/"{}"'.format(md5(":".join(str(part) for part in parts).encode()).hexdigest())
+
+
+def http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = pytz_timezone(settings.APP_TIMEZONE).localize(value)
+
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+
+    # Weak comparison, the W/ prefix is ignored on both sides
+    opaque_tag = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque_tag:
+            return True
+
+    return False
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+    return parsedate_to_datetime(http_date(last_modified)) <= since
+
+
+def conditional_response(
+    request: Request, response: Response, etag: str, last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    """
+    Adds the validators to the response and checks the conditional headers of the request.
+    If-None-Match takes precedence over If-Modified-Since as described in RFC 7232.
+    :param request: Request of the read
+    :param response: Response of the handler, the validator headers are set on it
+    :param etag: Weak ETag of the current representation
+    :param last_modified: Modification date of the representation, if it has a single one
+    :return: 304 response if the client's copy is still valid, otherwise None
+    """
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = bool(
+            if_modified_since and last_modified and _not_modified_since(if_modified_since, last_modified)
+        )
+
+    if not not_modified:
+        metrics.incr("conditional.miss")
+        return None
+
+    metrics.incr("conditional.not_modified")
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
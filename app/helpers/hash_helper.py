@@ -1,13 +1,87 @@
+from concurrent.futures import ProcessPoolExecutor
+from threading import BoundedSemaphore, Lock
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
-pwd_cxt = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from app.helpers.error_helper import ErrorCode as errors
+from app.helpers.metrics_helper import metrics
+from settings import settings
+
+# min/max rounds are pinned to the configured cost so that hashes created with another cost are rehashed on login.
+pwd_cxt = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = Lock()
+_capacity = settings.HASH_POOL_SIZE + settings.HASH_POOL_QUEUE_SIZE
+_slots = BoundedSemaphore(_capacity)
+
+metrics.gauge("hash.in_flight", lambda: _capacity - _slots._value)  # type: ignore
+
+
+def _hash(password: str) -> str:
+    return pwd_cxt.hash(password)
+
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    return pwd_cxt.verify_and_update(plain_password, hashed_password)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.HASH_POOL_SIZE)
+
+    return _executor
+
+
+def _run(name: str, func, *args):
+    """
+    Runs the given hash function in the process pool. If all workers are busy and the queue is full,
+    the request is rejected immediately instead of waiting.
+    """
+    if not settings.HASH_POOL_SIZE:
+        with metrics.timer("hash.{}_seconds".format(name)):
+            return func(*args)
+
+    if not _slots.acquire(blocking=False):
+        metrics.incr("hash.rejected")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=errors.hash_pool_busy,
+            headers={"Retry-After": str(settings.HASH_POOL_RETRY_AFTER)},
+        )
+
+    try:
+        with metrics.timer("hash.{}_seconds".format(name)):
+            return _get_executor().submit(func, *args).result()
+    finally:
+        _slots.release()
 
 
 class HashHelper:
     @staticmethod
     def get_password_hash(password):
-        return pwd_cxt.hash(password)
+        return _run("hash", _hash, password)
 
     @staticmethod
     def verify_password(hashed_password, plain_password):
-        return pwd_cxt.verify(plain_password, hashed_password)
+        verified, _ = HashHelper.verify_and_update(hashed_password, plain_password)
+        return verified
+
+    @staticmethod
+    def verify_and_update(hashed_password, plain_password) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies the password and returns a new hash if the stored one was created with another work factor
+        :return: (verified, new_hash or None)
+        """
+        return _run("verify", _verify_and_update, plain_password, hashed_password)
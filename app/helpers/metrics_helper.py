@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict
+
+
+class Metrics:
+    """
+    Process-local counters, timers and gauges. Each API worker keeps its own registry.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: Dict[str, int] = {}
+        self._timers: Dict[str, dict] = {}
+        self._gauges: Dict[str, Callable] = {}
+
+    def incr(self, name: str, value: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            timer = self._timers.setdefault(name, {"count": 0, "sum": 0.0, "max": 0.0})
+            timer["count"] += 1
+            timer["sum"] += seconds
+            timer["max"] = max(timer["max"], seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - start)
+
+    def gauge(self, name: str, func: Callable):
+        """
+        Registers a callable whose return value is read every time a snapshot is taken
+        """
+        self._gauges[name] = func
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {
+                name: dict(timer, avg=timer["sum"] / timer["count"] if timer["count"] else 0.0)
+                for name, timer in self._timers.items()
+            }
+
+        gauges = {name: func() for name, func in self._gauges.items()}
+
+        return {"counters": counters, "timers": timers, "gauges": gauges}
+
+
+metrics = Metrics()
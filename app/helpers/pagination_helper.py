@@ -0,0 +1,209 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from enum import Enum
+from typing import Generic, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, status
+from fastapi_pagination import Params
+from pydantic.generics import GenericModel
+from sqlalchemy import BigInteger, Integer, SmallInteger, func, select, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.helpers.error_helper import ErrorCode as errors
+
+T = TypeVar("T")
+
+
+class TotalMode(str, Enum):
+    exact = "exact"  # SELECT count(*) over the listing query
+    estimate = "estimate"  # Row estimate of the Postgres planner, no table scan
+    none = "none"  # Total is not calculated
+
+
+class Page(GenericModel, Generic[T]):
+    items: Sequence[T]
+    total: Optional[int]
+    page: int
+    size: int
+
+
+class Explain(Executable, ClauseElement):
+    """
+    EXPLAIN (FORMAT JSON) of a statement, compiled with the statement's own bind parameters
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+class CursorPage(GenericModel, Generic[T]):
+    items: Sequence[T]
+    next_cursor: Optional[str]
+    size: int
+
+
+class CursorParams:
+    """
+    Query parameters of the keyset (cursor) paginated listings
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="The next_cursor value of the previous page"),
+        size: int = Query(50, ge=1, le=100, description="Page size"),
+    ):
+        self.cursor = cursor
+        self.size = size
+
+
+def total_mode_query(default: TotalMode):
+    """
+    Returns a "total" query parameter whose default is chosen per route
+    """
+    return Query(default, description="How the total of the listing is calculated: exact, estimate or none")
+
+
+def estimate_count(db, query) -> int:
+    """
+    Returns the row estimate of the Postgres planner for the query. Falls back to an exact count on other databases.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return query.order_by(None).count()
+
+    plan = db.execute(Explain(query.order_by(None).statement)).scalar()
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _known_total(items: list, offset: int, params: Params) -> Optional[int]:
+    # When the last page is reached, the total is known without counting
+    if len(items) < params.size and (items or params.page == 1):
+        return offset + len(items)
+
+    return None
+
+
+def paginate(
+    db, query, params: Params, total_mode: TotalMode = TotalMode.exact, known_total: Optional[int] = None
+) -> dict:
+    """
+    Offset paginates the query. Unlike fastapi_pagination, the count query is only issued in the exact mode.
+    When the last page is reached, the total is known without counting in every mode.
+    :param db: Session of the request
+    :param query: SQLAlchemy query
+    :param params: Page and size of the request
+    :param total_mode: How the total is calculated
+    :param known_total: Total that the caller already knows (e.g. from a counter), nothing is counted then
+    :return: Page compatible dict
+    """
+    offset = (params.page - 1) * params.size
+    items = query.limit(params.size).offset(offset).all()
+    total = _known_total(items, offset, params) if known_total is None else known_total
+
+    if total is None and total_mode == TotalMode.exact:
+        total = query.order_by(None).count()
+    elif total is None and total_mode == TotalMode.estimate:
+        total = max(estimate_count(db, query), offset + len(items))
+
+    return {"items": items, "total": total, "page": params.page, "size": params.size}
+
+
+async def async_paginate(
+    db, statement, params: Params, total_mode: TotalMode = TotalMode.exact, known_total: Optional[int] = None
+) -> dict:
+    """
+    Same as paginate, for a select() statement executed on an AsyncSession
+    """
+    offset = (params.page - 1) * params.size
+    items = (await db.execute(statement.limit(params.size).offset(offset))).all()
+    total = _known_total(items, offset, params) if known_total is None else known_total
+
+    if total is None and total_mode == TotalMode.exact:
+        total = (await db.execute(select(func.count()).select_from(statement.order_by(None).subquery()))).scalar_one()
+    elif total is None and total_mode == TotalMode.estimate:
+        plan = (await db.execute(Explain(statement.order_by(None)))).scalar()
+        total = max(int(plan[0]["Plan"]["Plan Rows"]), offset + len(items))
+
+    return {"items": items, "total": total, "page": params.page, "size": params.size}
+
+
+def encode_cursor(values: list) -> str:
+    return urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode()
+
+
+def _valid_cursor_value(value, column) -> bool:
+    """
+    Checks the decoded value against the type of its key column, a wrong typed value would fail in the database
+    """
+    if isinstance(column.type, Integer):
+        # bool is a subclass of int, and the value must fit in the column (e.g. 4 bytes for an Integer)
+        bits = 64 if isinstance(column.type, BigInteger) else 16 if isinstance(column.type, SmallInteger) else 32
+        return type(value) is int and -(2 ** (bits - 1)) <= value < 2 ** (bits - 1)
+
+    return isinstance(value, column.type.python_type)
+
+
+def decode_cursor(cursor: str, key_columns: Sequence) -> list:
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (ValueError, RecursionError):
+        values = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(key_columns)
+        or not all(_valid_cursor_value(value, column) for value, column in zip(values, key_columns))
+    ):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=errors.invalid_cursor)
+
+    return values
+
+
+def _cursor_query(query, key_columns: Sequence, params: CursorParams):
+    if params.cursor:
+        values = decode_cursor(params.cursor, key_columns)
+
+        if len(key_columns) == 1:
+            query = query.filter(key_columns[0] > values[0])
+        else:
+            query = query.filter(tuple_(*key_columns) > tuple_(*values))
+
+    return query.order_by(*key_columns).limit(params.size + 1)
+
+
+def _cursor_page(rows: list, key_columns: Sequence, params: CursorParams) -> dict:
+    next_cursor = None
+    if len(rows) > params.size:
+        rows = rows[: params.size]
+        next_cursor = encode_cursor([getattr(rows[-1], column.key) for column in key_columns])
+
+    return {"items": rows, "next_cursor": next_cursor, "size": params.size}
+
+
+def cursor_paginate(query, key_columns: Sequence, params: CursorParams) -> dict:
+    """
+    Paginates the query on the given unique, ascending key columns. Each page is a single indexed range scan,
+    so its cost does not depend on how deep the client has scrolled.
+    :param query: SQLAlchemy query (rows must expose the key columns by their names)
+    :param key_columns: Columns that build the cursor, the last one must be unique (e.g. [Card.id])
+    :param params: Cursor and page size of the request
+    :return: CursorPage compatible dict
+    """
+    return _cursor_page(_cursor_query(query, key_columns, params).all(), key_columns, params)
+
+
+async def async_cursor_paginate(db, statement, key_columns: Sequence, params: CursorParams) -> dict:
+    """
+    Same as cursor_paginate, for a select() statement executed on an AsyncSession
+    """
+    rows = (await db.execute(_cursor_query(statement, key_columns, params))).all()
+
+    return _cursor_page(rows, key_columns, params)
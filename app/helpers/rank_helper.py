@@ -0,0 +1,93 @@
+from typing import List, Optional
+
+# Positions are base 62 fractions written without the leading "0.", e.g. "V" is 0.5.
+# They are compared byte by byte (the column uses the "C" collation) and never end with the smallest digit,
+# so there is always room for another position between two of them.
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+
+def _digit(position: str, index: int) -> int:
+    return DIGITS.index(position[index]) if index < len(position) else 0
+
+
+def _midpoint(before: str, after: Optional[str]) -> str:
+    # Shared digits are kept as they are
+    prefix_length = 0
+    if after is not None:
+        while prefix_length < len(after) and _digit(before, prefix_length) == _digit(after, prefix_length):
+            prefix_length += 1
+
+    prefix = after[:prefix_length] if after is not None else ""
+    before, after = before[prefix_length:], (after[prefix_length:] if after is not None else None)
+
+    low = _digit(before, 0)
+    high = _digit(after, 0) if after is not None else BASE
+
+    if high - low > 1:
+        return prefix + DIGITS[(low + high + 1) // 2]
+
+    # Consecutive digits, the position gets one digit longer
+    if after is not None and len(after) > 1:
+        return prefix + after[0]
+
+    return prefix + DIGITS[low] + _midpoint(before[1:], None)
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Returns a position that sorts between the given positions
+    :param before: Position of the previous card, None for the start of the list
+    :param after: Position of the next card, None for the end of the list
+    :return: New position
+    """
+    before = before or ""
+
+    if after is None:
+        # Cards are mostly added to the end of a list, so appending takes the next digit instead of the middle
+        head = _digit(before, 0)
+        if head < BASE - 1:
+            return DIGITS[head + 1]
+
+        return DIGITS[-1] + rank_between(before[1:], None)
+
+    if before >= after:
+        raise ValueError("before must be lower than after")
+
+    return _midpoint(before, after)
+
+
+def ranks_between(before: Optional[str], after: Optional[str], count: int) -> List[str]:
+    """
+    Returns "count" ascending positions between the given positions. The range is split in halves,
+    so the length of the positions grows with log(count) instead of count.
+    """
+    if count <= 0:
+        return []
+
+    middle = _midpoint(before or "", after)
+    left = (count - 1) // 2
+
+    return ranks_between(before, middle, left) + [middle] + ranks_between(middle, after, count - 1 - left)
+
+
+def even_ranks(count: int) -> List[str]:
+    """
+    Returns "count" evenly spaced positions of the shortest possible length, used for rebalancing
+    """
+    length = 1
+    while BASE**length <= count:
+        length += 1
+
+    step = BASE**length // (count + 1)
+    ranks = []
+
+    for index in range(1, count + 1):
+        value, digits = step * index, []
+        for _ in range(length):
+            value, digit = divmod(value, BASE)
+            digits.append(DIGITS[digit])
+
+        ranks.append("".join(reversed(digits)).rstrip(DIGITS[0]))
+
+    return ranks
@@ -0,0 +1,142 @@
+import asyncio
+import json
+from threading import Lock
+from typing import Dict, Optional, Set
+
+from redis import Redis, RedisError
+from redis.asyncio import Redis as AsyncRedis
+
+from app.helpers.metrics_helper import metrics
+from settings import settings
+
+CHANNEL_PREFIX = "coyote:board:"
+
+_publisher: Optional[Redis] = None
+_publisher_lock = Lock()
+
+
+def _get_publisher() -> Redis:
+    global _publisher
+
+    with _publisher_lock:
+        if _publisher is None:
+            _publisher = Redis.from_url(settings.REALTIME_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+    return _publisher
+
+
+def publish_board_event(board_id: int, version: int, event_type: str, *ids: int):
+    """
+    Publishes a board event to the subscribers of all API processes. It must be called after the commit.
+    A lost event only delays the clients until they sync with the change feed, so errors are not raised.
+    :param board_id: ID number of the changed board
+    :param version: Board version of the change
+    :param event_type: Type of the event (e.g. card.updated)
+    :param ids: ID numbers of the changed cards or the users of the changed memberships
+    """
+    if not settings.REALTIME_REDIS_URL:
+        return
+
+    event = {"type": event_type, "board_id": board_id, "version": version, "ids": list(ids)}
+
+    try:
+        _get_publisher().publish(CHANNEL_PREFIX + str(board_id), json.dumps(event))
+        metrics.incr("realtime.published")
+    except RedisError:
+        metrics.incr("realtime.publish_error")
+
+
+class BoardSubscription:
+    """
+    Event queue of a single connection. A slow consumer never blocks the hub: when its queue is full,
+    the backlog is dropped and replaced with a reset event, after which the client syncs with the change feed.
+    """
+
+    def __init__(self, board_id: int):
+        self.board_id = board_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=settings.REALTIME_QUEUE_SIZE)
+
+    def put(self, event: dict):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            metrics.incr("realtime.overflow")
+            self.reset()
+
+    def reset(self):
+        while not self.queue.empty():
+            self.queue.get_nowait()
+
+        self.queue.put_nowait({"type": "reset", "board_id": self.board_id})
+
+
+class BoardEventHub:
+    """
+    Process-wide fan-out of the board events. A single Redis connection per process receives the events
+    of all boards and hands them to the local subscriptions of the board.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[int, Set[BoardSubscription]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def __len__(self):
+        return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, board_id: int) -> BoardSubscription:
+        loop = asyncio.get_running_loop()
+
+        if self._listener is None or self._listener.done() or self._loop is not loop:
+            self._loop = loop
+            self._listener = loop.create_task(self._listen())
+
+        subscription = BoardSubscription(board_id)
+        self._subscriptions.setdefault(board_id, set()).add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: BoardSubscription):
+        subscriptions = self._subscriptions.get(subscription.board_id)
+
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+
+            if not subscriptions:
+                del self._subscriptions[subscription.board_id]
+
+    def _dispatch(self, event: dict):
+        for subscription in list(self._subscriptions.get(event["board_id"], ())):
+            subscription.put(event)
+
+    async def _listen(self):
+        missed = False
+
+        while True:
+            client = AsyncRedis.from_url(settings.REALTIME_REDIS_URL)
+
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.psubscribe(CHANNEL_PREFIX + "*")
+
+                # Events published while the connection was lost are gone, the subscribers sync again
+                if missed:
+                    missed = False
+                    for subscriptions in self._subscriptions.values():
+                        for subscription in subscriptions:
+                            subscription.reset()
+
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(json.loads(message["data"]))
+            except (RedisError, OSError):
+                metrics.incr("realtime.listener_error")
+                missed = True
+                await asyncio.sleep(1)
+            finally:
+                await client.close()
+
+
+hub = BoardEventHub()
+
+metrics.gauge("realtime.subscriptions", lambda: len(hub))
@@ -0,0 +1,37 @@
+from typing import Optional, Type
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+def to_out(model: Type[BaseModel], obj, **values) -> dict:
+    """
+    Maps an ORM object or a result row to the fields of the output model. The values are trusted as they come
+    from the database, so they are neither validated nor encoded again; orjson renders them directly.
+    :param model: Output schema whose fields will be read
+    :param obj: ORM object or row that has an attribute for every field not given in "values"
+    :param values: Fields that are not attributes of the object (e.g. the role of the user)
+    :return: Plain dict ready to be rendered
+    """
+    data = {name: getattr(obj, name) for name in model.__fields__ if name not in values}
+    data.update(values)
+
+    return data
+
+
+def page_out(model: Type[BaseModel], page: dict) -> dict:
+    """
+    Maps the items of a Page or CursorPage compatible dict to the output model
+    """
+    return dict(page, items=[to_out(model, item) for item in page["items"]])
+
+
+def fast_response(content, response: Optional[Response] = None) -> ORJSONResponse:
+    """
+    Renders the content with orjson and skips the response_model validation of FastAPI.
+    The response_model of the route is still used for the documentation.
+    :param content: Output of to_out/page_out or any orjson serializable value
+    :param response: Response of the handler, its headers (e.g. ETag) are copied
+    """
+    return ORJSONResponse(content, headers=dict(response.headers) if response is not None else None)
@@ -1,11 +1,17 @@
 from datetime import datetime, timedelta
+from time import time
 from typing import Optional
 
 from fastapi import HTTPException, status
 from jwt import decode, encode
 
+from app.helpers.cache_helper import TTLCache
+from app.helpers.metrics_helper import metrics
 from settings import settings
 
+# Already verified tokens, so hot clients do not pay for a JWT decode on every request.
+verified_tokens = TTLCache(max_size=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_TTL)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_jwt_encode = data.copy()
@@ -22,6 +28,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 
 
 def verify_access_token(token: str):
+    data = verified_tokens.get(token)
+
+    if data is not None and data["exp"] > time():
+        metrics.incr("token_cache.hit")
+        return data
+
+    metrics.incr("token_cache.miss")
+
     try:
         data = decode(token, settings.SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         if data is None:
@@ -30,6 +44,8 @@ def verify_access_token(token: str):
                 detail="Could not validate credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
+
+        verified_tokens.set(token, data, ttl=min(settings.TOKEN_CACHE_TTL, data["exp"] - time()))
         return data
     except Exception:
         raise HTTPException(
@@ -1,29 +1,37 @@
-from datetime import datetime
-
-from pytz import timezone
+from pytz import timezone, utc
 from sqlalchemy import Column
 from sqlalchemy import DateTime as OldDateTime
-from sqlalchemy import Integer
+from sqlalchemy import Integer, func
 from sqlalchemy.types import TypeDecorator
 
 from app.db.database import Base
 from settings import settings
 
+APP_TIMEZONE = timezone(settings.APP_TIMEZONE)
+
 
 class DateTime(TypeDecorator):  # noqa
-    impl = OldDateTime
+    """
+    Timezone-aware timestamp stored in UTC. Naive values are taken as the wall time of APP_TIMEZONE.
+    """
+
+    impl = OldDateTime(timezone=True)
     cache_ok = True
 
     def process_bind_param(self, value, engine):
-        return datetime.now(timezone(settings.APP_TIMEZONE))
+        if value is None:
+            return None
+
+        if value.tzinfo is None:
+            value = APP_TIMEZONE.localize(value)
 
-    def process_result_value(self, value, engine):
-        return value
+        return value.astimezone(utc)
 
 
 class BaseModel(Base):
     __abstract__ = True
 
     id = Column(Integer, primary_key=True)
-    date_created = Column(DateTime, default=datetime.now)
-    date_modified = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+    # Set by the database, so the inserts and updates (also the bulk ones) do not compute them row by row
+    date_created = Column(DateTime, server_default=func.now())
+    date_modified = Column(DateTime, server_default=func.now(), onupdate=func.now())
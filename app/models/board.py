@@ -1,9 +1,25 @@
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    and_,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 
 from app.models.base import BaseModel
 from app.models.enums import State, Status
 from app.models.enums.board import BoardStatus, CardState, UserRoleType
 
+# Text search configuration of the search vectors and queries, the triggers of migration aa5ff28ca3f6 use the same.
+# "simple" does not stem, so it works for every language.
+SEARCH_CONFIG = "simple"
+
 
 class Board(BaseModel):
     __tablename__ = "board"  # noqa
@@ -11,15 +27,38 @@ class Board(BaseModel):
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     status = Column(Enum(BoardStatus), nullable=False, default=BoardStatus.active)
+    version = Column(Integer, nullable=False, default=0)  # Bumped on every change of the board, its members or cards
+    seq = Column(Integer, nullable=False, default=0)  # Board version of the last change of this row
+    purged_seq = Column(Integer, nullable=False, default=0)  # Highest sequence of the purged cards of the board
+    # Active cards per state, updated together with the version by every card write
+    todo_count = Column(Integer, nullable=False, default=0)
+    in_progress_count = Column(Integer, nullable=False, default=0)
+    in_review_count = Column(Integer, nullable=False, default=0)
+    done_count = Column(Integer, nullable=False, default=0)
+    # Set by the board_search_vector_update trigger from the name and the description, see migration aa5ff28ca3f6
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        Index("ix_board_search_vector", "search_vector", postgresql_using="gin"),
+        # Trigram index of the "%...%" name filter of the board listings, needs the pg_trgm extension
+        Index("ix_board_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
 
 
 class BoardUser(BaseModel):
     __tablename__ = "board_user"  # noqa
 
     user_id = Column(Integer, ForeignKey("user.id"))
-    board_id = Column(Integer, ForeignKey("user.id"))
+    board_id = Column(Integer, ForeignKey("board.id"))
     role = Column(Enum(UserRoleType), nullable=False, default=UserRoleType.member)
     status = Column(Enum(State), nullable=False, default=State.waiting)
+    seq = Column(Integer, nullable=False, default=0)  # Board version of the last change of this row
+
+    __table_args__ = (
+        Index("ix_board_user_board_id_user_id", "board_id", "user_id", unique=True),
+        Index("ix_board_user_board_id_seq", "board_id", "seq"),
+        Index("ix_board_user_user_id_status", "user_id", "status"),
+    )
 
 
 class Card(BaseModel):
@@ -35,10 +74,71 @@ class Card(BaseModel):
     finish_date = Column(DateTime, nullable=True)
     state = Column(Enum(CardState), nullable=False, default=CardState.todo)
     status = Column(Enum(Status), nullable=False, default=Status.active)
+    seq = Column(Integer, nullable=False, default=0)  # Board version of the last change of this row
+    position = Column(String(255, collation="C"), nullable=False)  # Rank of the card in its state, see rank_helper
+    comment_count = Column(Integer, nullable=False, default=0)  # Active comments, updated with every comment change
+    # Set by the card_search_vector_update trigger from the title and the content, see migration aa5ff28ca3f6
+    search_vector = deferred(Column(TSVECTOR, nullable=True))
+
+    __table_args__ = (
+        Index("ix_card_board_id_status_id", "board_id", "status", "id"),
+        Index("ix_card_board_id_seq", "board_id", "seq"),
+        Index("ix_card_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_card_deleted_id", "id", postgresql_where=status == Status.deleted),
+        # Partial indexes of the card listing filters and sort orders
+        Index("ix_card_board_id_state_id", board_id, state, "id", postgresql_where=status == Status.active),
+        Index(
+            "ix_card_board_id_assignment_id_id", board_id, assignment_id, "id", postgresql_where=status == Status.active
+        ),
+        Index("ix_card_board_id_owner_id_id", board_id, owner_id, "id", postgresql_where=status == Status.active),
+        Index(
+            "ix_card_board_id_estimated_start_id",
+            board_id,
+            estimated_start,
+            "id",
+            postgresql_where=status == Status.active,
+        ),
+        Index(
+            "ix_card_board_id_estimated_finish_id",
+            board_id,
+            estimated_finish,
+            "id",
+            postgresql_where=status == Status.active,
+        ),
+        Index(
+            "ix_card_board_id_date_created_id", board_id, "date_created", "id", postgresql_where=status == Status.active
+        ),
+        Index(
+            "ix_card_board_id_date_modified_id",
+            board_id,
+            "date_modified",
+            "id",
+            postgresql_where=status == Status.active,
+        ),
+        Index("ix_card_board_id_state_position", board_id, state, position, postgresql_where=status == Status.active),
+        # Partial indexes of the TaskCore reminder scans
+        Index(
+            "ix_card_start_reminder",
+            estimated_start,
+            postgresql_where=and_(state == CardState.todo, status == Status.active),
+        ),
+        Index(
+            "ix_card_finish_reminder",
+            estimated_finish,
+            postgresql_where=and_(state != CardState.done, status == Status.active),
+        ),
+    )
 
 
 class Comment(BaseModel):
     __tablename__ = "comment"  # noqa
 
     user_id = Column(Integer, ForeignKey("user.id"))
+    card_id = Column(Integer, ForeignKey("card.id"))
     content = Column(Text, nullable=False)
+    status = Column(Enum(Status), nullable=False, default=Status.active)
+
+    __table_args__ = (
+        Index("ix_comment_card_id_id", card_id, "id", postgresql_where=status == Status.active),
+        Index("ix_comment_deleted_id", "id", postgresql_where=status == Status.deleted),
+    )
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, String
+from sqlalchemy import Boolean, Column, DateTime, Enum, Index, Integer, String, func
 from sqlalchemy.orm import column_property
 
 from app.models.base import BaseModel
@@ -20,3 +20,6 @@ class User(BaseModel):
     email_verification_code_exp_date = Column(DateTime, nullable=False, default=datetime.now())
     password_hash = Column(String(120), nullable=False)
     status = Column(Enum(Status), nullable=False, default=Status.active)
+    token_version = Column(Integer, nullable=False, default=0)  # Bump to revoke issued access tokens
+
+    __table_args__ = (Index("ix_user_email_lower", func.lower(email), unique=True),)
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+from pytz import utc
+
+from app.core.board import BoardCore
+from app.db.database import SessionLocal
+from app.models.enums.board import CardState
+from app.worker import celery_app
+from settings import settings
+
+
+@celery_app.task(name="rebalance_card_positions", ignore_result=True)
+def rebalance_card_positions(board_id: int, state: str) -> int:
+    db = SessionLocal()
+    try:
+        return BoardCore(db).rebalance_card_positions(board_id=board_id, state=CardState(state))
+    finally:
+        db.close()
+
+
+@celery_app.task(name="reconcile_card_counts", ignore_result=True)
+def reconcile_card_counts() -> int:
+    db = SessionLocal()
+    try:
+        return BoardCore(db).reconcile_card_counts()
+    finally:
+        db.close()
+
+
+@celery_app.task(name="purge_deleted_rows", ignore_result=True)
+def purge_deleted_rows() -> dict:
+    before = datetime.now(utc) - timedelta(days=settings.PURGE_RETENTION)
+
+    db = SessionLocal()
+    try:
+        return BoardCore(db).purge_deleted(before=before)
+    finally:
+        db.close()
@@ -0,0 +1,21 @@
+from app.core.task import TaskCore
+from app.db.database import SessionLocal
+from app.worker import celery_app
+
+
+@celery_app.task(name="card_start_reminder")
+def card_start_reminder() -> int:
+    db = SessionLocal()
+    try:
+        return TaskCore(db).card_start_reminder()
+    finally:
+        db.close()
+
+
+@celery_app.task(name="card_finish_reminder")
+def card_finish_reminder() -> int:
+    db = SessionLocal()
+    try:
+        return TaskCore(db).card_finish_reminder()
+    finally:
+        db.close()
@@ -2,4 +2,23 @@ from celery import Celery
 
 from settings import settings
 
-celery_app = Celery("tasks", broker=settings.CELERY_BROKER_URL, backend=settings.CELERY_RESULT_BACKEND)
+celery_app = Celery(
+    "tasks",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.board", "app.tasks.task"],
+)
+
+# Periodic tasks, run with "celery -A app.worker.celery_app beat"
+celery_app.conf.beat_schedule = {
+    "reconcile-card-counts": {
+        "task": "reconcile_card_counts",
+        "schedule": settings.BOARD_COUNTS_RECONCILE_INTERVAL,
+    },
+    "purge-deleted-rows": {
+        "task": "purge_deleted_rows",
+        "schedule": settings.PURGE_INTERVAL,
+        # A run that could not start before the next one is dropped, so the runs do not pile up
+        "options": {"expires": settings.PURGE_INTERVAL},
+    },
+}
@@ -0,0 +1,90 @@
+"""
+Measures the card inserts of the bulk endpoint (one multi-row INSERT) and of the ORM (executemany pages).
+Each run is rolled back, so the board is left as it is. The board must exist in the configured database.
+
+The "python" column is the time spent before the statement is sent: building the rows, compiling the statement
+and processing the bound values. The "database" column is the rest of the run.
+
+    ~$ python -m benchmarks.bulk_insert --board-id 1 --rows 1000 --repeat 10
+"""
+import argparse
+from statistics import median
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal, engine
+from app.models.board import BoardUser, Card
+from app.models.enums.board import CardState, UserRoleType
+
+
+def _rows(board_id: int, owner_id: int, count: int) -> List[dict]:
+    return [
+        {"board_id": board_id, "owner_id": owner_id, "title": "Card {}".format(index), "position": str(index)}
+        for index in range(count)
+    ]
+
+
+def _insert_statement(db: Session, rows: List[dict]):
+    db.execute(insert(Card).values([dict(row, state=CardState.todo) for row in rows]))
+
+
+def _insert_orm(db: Session, rows: List[dict]):
+    db.add_all([Card(**row) for row in rows])
+    db.flush()
+
+
+def _run(insert_rows: Callable, board_id: int, owner_id: int, count: int) -> Tuple[float, float]:
+    sent_at = []
+
+    def before_execute(*args):
+        if not sent_at:
+            sent_at.append(perf_counter())
+
+    db = SessionLocal()
+    event.listen(engine, "before_cursor_execute", before_execute)
+
+    try:
+        db.connection()  # The connection checkout is not measured
+        start = perf_counter()
+        insert_rows(db, _rows(board_id, owner_id, count))
+        end = perf_counter()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+        db.rollback()
+        db.close()
+
+    return sent_at[0] - start, end - sent_at[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--board-id", type=int, required=True)
+    parser.add_argument("--rows", type=int, default=1000, help="Cards per insert")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per method, the median is reported")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        owner_id = db.execute(
+            select(BoardUser.user_id).where(BoardUser.board_id == args.board_id, BoardUser.role == UserRoleType.owner)
+        ).scalar_one()
+    finally:
+        db.close()
+
+    print("{:<10} {:>14} {:>14} {:>14} {:>10}".format("method", "python (ms)", "database (ms)", "total (ms)", "rows/s"))
+    for name, insert_rows in (("statement", _insert_statement), ("orm", _insert_orm)):
+        runs = [_run(insert_rows, args.board_id, owner_id, args.rows) for _ in range(args.repeat)]
+        python, database = median(run[0] for run in runs), median(run[1] for run in runs)
+
+        print(
+            "{:<10} {:>14.1f} {:>14.1f} {:>14.1f} {:>10.0f}".format(
+                name, python * 1000, database * 1000, (python + database) * 1000, args.rows / (python + database)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
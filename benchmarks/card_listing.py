@@ -0,0 +1,156 @@
+"""
+Compares the sustained throughput and the p99 latency of the card listing on the sync and the async database paths.
+
+The benchmark serves both paths from a separate application without authentication, so only the listing query,
+the pagination and the serialization are measured. The board must exist in the configured database.
+
+    ~$ python -m benchmarks.card_listing --board-id 1 --concurrency 64 --duration 20
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from os import path
+
+from fastapi import Depends, FastAPI
+from fastapi_pagination import Params
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.api.v1.schemas.board import CardOrderBy, CardOut
+from app.core.board import AsyncBoardCore, BoardCore
+from app.db.database import get_async_db, get_db
+from app.helpers.pagination_helper import TotalMode
+from app.helpers.response_helper import fast_response, page_out
+from app.models.board import Board
+
+BASEDIR = path.dirname(path.dirname(path.abspath(__file__)))
+
+app = FastAPI()
+
+
+@app.get("/sync/{board_id}")
+def get_cards_sync(board_id: int, params: Params = Depends(), db: Session = Depends(get_db)):
+    cards = BoardCore(db).get_all_cards(
+        board=Board(id=board_id), filters=None, order_by=CardOrderBy.id, params=params, total_mode=TotalMode.estimate
+    )
+    return fast_response(page_out(CardOut, cards))
+
+
+@app.get("/async/{board_id}")
+async def get_cards_async(board_id: int, params: Params = Depends(), db: AsyncSession = Depends(get_async_db)):
+    cards = await AsyncBoardCore(db).get_all_cards(
+        board=Board(id=board_id), filters=None, order_by=CardOrderBy.id, params=params, total_mode=TotalMode.estimate
+    )
+    return fast_response(page_out(CardOut, cards))
+
+
+async def _client(host: str, port: int, target: str, deadline: float, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+    request = "GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".format(target=target, host=host).encode()
+
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.write(request)
+
+            status = await reader.readline()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - started)
+            if not status.startswith(b"HTTP/1.1 200"):
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def _load(host: str, port: int, target: str, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+
+    await asyncio.gather(
+        *(_client(host, port, target, deadline, latencies, errors) for _ in range(concurrency)),
+    )
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "rps": len(latencies) / duration,
+        "p50": latencies[len(latencies) // 2] * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0,
+    }
+
+
+def _wait_for_server(host: str, port: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+
+    while time.monotonic() < deadline:
+        try:
+            asyncio.run(asyncio.wait_for(asyncio.open_connection(host, port), 1))
+            return
+        except OSError:
+            time.sleep(0.2)
+
+    raise RuntimeError("Benchmark server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--board-id", type=int, required=True)
+    parser.add_argument("--size", type=int, default=50, help="Cards per page")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per path")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds per path before measuring")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "benchmarks.card_listing:app",
+            "--host",
+            args.host,
+            "--port",
+            str(args.port),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=BASEDIR,
+    )
+
+    try:
+        _wait_for_server(args.host, args.port)
+
+        print(
+            "{:<6} {:>10} {:>8} {:>10} {:>10} {:>8}".format("path", "requests", "rps", "p50 (ms)", "p99 (ms)", "errors")
+        )
+        for name in ("sync", "async"):
+            target = "/{name}/{board_id}?size={size}".format(name=name, board_id=args.board_id, size=args.size)
+
+            asyncio.run(_load(args.host, args.port, target, args.concurrency, args.warmup))
+            result = asyncio.run(_load(args.host, args.port, target, args.concurrency, args.duration))
+
+            print(
+                "{:<6} {requests:>10} {rps:>8.0f} {p50:>10.1f} {p99:>10.1f} {errors:>8}".format(name, **result),
+            )
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
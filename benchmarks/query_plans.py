@@ -0,0 +1,114 @@
+"""
+Checks that the hot queries are served by indexes. The queries are recorded while the cores run them, then each
+one is planned with EXPLAIN and the command fails if a plan reads one of the tables with a sequential scan.
+
+Small tables are cheaper to read sequentially, so by default sequential scans are disabled while planning: the
+check then shows whether an index can serve the query. With "--planner-costs" the plans are taken as they are,
+which is meaningful on a database of production size. The board must exist in the configured database.
+
+    ~$ python -m benchmarks.query_plans --board-id 1
+"""
+import argparse
+import sys
+from typing import Callable, Iterator, List, Tuple
+
+from fastapi_pagination import Params
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.board import BoardCore
+from app.core.task import TaskCore
+from app.core.user import UserCore
+from app.db.database import SessionLocal, engine
+from app.models.board import Board, BoardUser, Card
+from app.models.enums.board import CardState, UserRoleType
+from app.models.user import User
+
+
+def _hot_queries(db: Session, board: Board, user: User) -> List[Tuple[str, Callable]]:
+    board_core, task_core = BoardCore(db), TaskCore(db)
+
+    return [
+        ("get_user_by_email", lambda: UserCore(db).get_user_by_email(user.email, show_error=False)),
+        ("check_board_member", lambda: board_core.check_board_member(board, user, show_error=False)),
+        ("get_all_boards", lambda: board_core.get_all_boards(user, params=Params())),
+        ("get_all_cards", lambda: board_core.get_all_cards(board, params=Params())),
+        (
+            "card_start_reminder",
+            lambda: next(
+                task_core._due_cards(Card.estimated_start, Card.state == CardState.todo, batch_size=100), None
+            ),
+        ),
+        (
+            "card_finish_reminder",
+            lambda: next(
+                task_core._due_cards(Card.estimated_finish, Card.state != CardState.done, batch_size=100), None
+            ),
+        ),
+    ]
+
+
+def _record(run: Callable) -> List[Tuple[str, dict]]:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+
+    return statements
+
+
+def _scans(plan: dict) -> Iterator[Tuple[str, str, str]]:
+    """
+    Yields (node type, table, index) of the scan nodes of the plan
+    """
+    if "Relation Name" in plan or "Index Name" in plan:
+        yield plan["Node Type"], plan.get("Relation Name", ""), plan.get("Index Name", "")
+
+    for child in plan.get("Plans", []):
+        yield from _scans(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--board-id", type=int, required=True)
+    parser.add_argument("--planner-costs", action="store_true", help="Plan without disabling the sequential scans")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    failures = []
+
+    try:
+        board = db.get(Board, args.board_id)
+        user = db.execute(
+            select(User)
+            .join(BoardUser, BoardUser.user_id == User.id)
+            .where(BoardUser.board_id == args.board_id, BoardUser.role == UserRoleType.owner)
+        ).scalar_one()
+
+        for name, run in _hot_queries(db, board, user):
+            for statement, parameters in _record(run):
+                connection = db.connection()
+                if not args.planner_costs:
+                    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+
+                plan = connection.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+                for node, table, index in _scans(plan[0]["Plan"]):
+                    print("{:<22} {:<18} {:<12} {}".format(name, node, table, index))
+                    if node == "Seq Scan":
+                        failures.append("{}: {}".format(name, table))
+    finally:
+        db.rollback()
+        db.close()
+
+    if failures:
+        sys.exit("Sequential scans:\n" + "\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
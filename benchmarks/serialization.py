@@ -0,0 +1,94 @@
+"""
+Compares the serialization of a card page on the old path (validation of Page[CardOut], jsonable_encoder and
+JSONResponse, as FastAPI does for a response_model) and on page_out with fast_response. The cards are built in
+memory, so no database is needed. Both paths must render the same JSON, the benchmark fails otherwise.
+
+    ~$ python -m benchmarks.serialization --cards 100 --repeat 1000
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from statistics import median
+from time import perf_counter
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from fastapi_pagination import Page, Params
+from pytz import utc
+
+from app.api.v1.schemas.board import CardOut
+from app.helpers.response_helper import fast_response, page_out
+from app.models.board import Card
+from app.models.enums.board import CardState
+
+FIELD = create_response_field(name="Response_Page_CardOut", type_=Page[CardOut])
+
+
+def _cards(count: int) -> List[Card]:
+    now = datetime(2026, 10, 18, 9, 30, 15, 123456, tzinfo=utc)
+    states = list(CardState)
+
+    return [
+        Card(
+            id=index + 1,
+            date_created=now + timedelta(minutes=index),
+            date_modified=now + timedelta(minutes=index, seconds=index % 7),
+            assignment_id=index % 5 or None,
+            title='Kart {} "ığüşöç"'.format(index),
+            content="İçerik\n{}".format(index) if index % 3 else None,
+            estimated_start=datetime(2026, 11, 1, 10) + timedelta(days=index) if index % 2 else None,
+            estimated_finish=None,
+            finish_date=now if index % 4 == 0 else None,
+            state=states[index % len(states)],
+            position=str(index).zfill(4),
+            comment_count=index % 11,
+        )
+        for index in range(count)
+    ]
+
+
+async def _old(cards: List[Card], params: Params) -> bytes:
+    page = Page[CardOut].create(items=cards, total=len(cards), params=params)
+    content = await serialize_response(field=FIELD, response_content=page)
+    return JSONResponse(content).body
+
+
+async def _new(cards: List[Card], params: Params) -> bytes:
+    page = {"items": cards, "total": len(cards), "page": params.page, "size": params.size}
+    return fast_response(page_out(CardOut, page)).body
+
+
+async def _measure(render: Callable, cards: List[Card], params: Params, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = perf_counter()
+        await render(cards, params)
+        runs.append(perf_counter() - start)
+
+    return median(runs)
+
+
+async def _run(count: int, repeat: int):
+    cards, params = _cards(count), Params(page=1, size=count)
+
+    old, new = await _old(cards, params), await _new(cards, params)
+    assert old == new, "The paths render different JSON:\nold: {}\nnew: {}".format(old.decode(), new.decode())
+
+    print("{:<6} {:>12} {:>10}".format("path", "median (us)", "bytes"))
+    for name, render, body in (("old", _old, old), ("new", _new, new)):
+        print("{:<6} {:>12.0f} {:>10}".format(name, await _measure(render, cards, params, repeat) * 1e6, len(body)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cards", type=int, default=100, help="Cards per page")
+    parser.add_argument("--repeat", type=int, default=1000, help="Runs per path, the median is reported")
+    args = parser.parse_args()
+
+    asyncio.run(_run(args.cards, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
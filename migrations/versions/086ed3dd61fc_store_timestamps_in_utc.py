@@ -0,0 +1,102 @@
+"""store timestamps in utc
+
+Revision ID: 086ed3dd61fc
+Revises: d92c4a7e61b5
+Create Date: 2026-10-19 10:14:52.518306
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+from settings import settings
+
+# revision identifiers, used by Alembic.
+revision = "086ed3dd61fc"
+down_revision = "d92c4a7e61b5"
+branch_labels = None
+depends_on = None
+
+TABLES = ("user", "board", "board_user", "card", "comment")
+COLUMNS = ("date_created", "date_modified")
+
+# Rows updated per transaction of the backfill
+BATCH_SIZE = 5000
+
+# Indexes on the converted columns: name, table, columns, condition. They are built on the new columns before the swap.
+INDEXES = (("ix_card_board_id_date_modified", "card", ("board_id", "date_modified"), "status = 'active'"),)
+
+
+def _new(column: str) -> str:
+    return column + "_new"
+
+
+def _converted(column: str, row: str = "") -> str:
+    # The values are read as the wall time of APP_TIMEZONE, "AT TIME ZONE" converts in both directions
+    return "{}{} AT TIME ZONE '{}'".format(row, column, settings.APP_TIMEZONE)
+
+
+def _convert(timezone: bool, default: str):
+    """
+    Converts the date columns without rewriting the tables under an exclusive lock, ALTER COLUMN ... TYPE would
+    block the reads and writes of each table until it is rewritten:
+    1. A new column is added for each date column, this is only a catalog change. A trigger fills it on writes.
+    2. The existing rows are backfilled in ID batches, each batch is committed on its own.
+    3. The indexes on the date columns are built on the new columns concurrently.
+    4. The old columns are dropped and the new ones are renamed. These are catalog changes, the locks are held
+       only until the end of the migration.
+    """
+    for table in TABLES:
+        for column in COLUMNS:
+            op.add_column(table, sa.Column(_new(column), sa.DateTime(timezone=timezone), nullable=True))
+
+        assignments = "".join("NEW.{} := {}; ".format(_new(column), _converted(column, "NEW.")) for column in COLUMNS)
+        op.execute(
+            "CREATE FUNCTION {table}_convert_dates() RETURNS trigger AS $$ BEGIN {assignments}RETURN NEW; END $$ "
+            "LANGUAGE plpgsql".format(table=table, assignments=assignments)
+        )
+        op.execute(
+            'CREATE TRIGGER {table}_convert_dates BEFORE INSERT OR UPDATE ON "{table}" '
+            "FOR EACH ROW EXECUTE FUNCTION {table}_convert_dates()".format(table=table)
+        )
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+
+        for table in TABLES:
+            values = ", ".join("{} = {}".format(_new(column), _converted(column)) for column in COLUMNS)
+            last_id = connection.execute(sa.text('SELECT coalesce(max(id), 0) FROM "{}"'.format(table))).scalar()
+
+            for start in range(0, last_id, BATCH_SIZE):
+                connection.execute(
+                    sa.text('UPDATE "{}" SET {} WHERE id > :start AND id <= :end'.format(table, values)),
+                    {"start": start, "end": start + BATCH_SIZE},
+                )
+
+        for name, table, columns, condition in INDEXES:
+            op.create_index(
+                _new(name),
+                table,
+                [_new(column) if column in COLUMNS else column for column in columns],
+                postgresql_where=sa.text(condition),
+                postgresql_concurrently=True,
+            )
+
+    for table in TABLES:
+        op.execute('DROP TRIGGER {table}_convert_dates ON "{table}"'.format(table=table))
+        op.execute("DROP FUNCTION {}_convert_dates()".format(table))
+
+        for column in COLUMNS:
+            op.drop_column(table, column)
+            op.alter_column(table, _new(column), new_column_name=column)
+            op.execute('ALTER TABLE "{}" ALTER COLUMN {} {}'.format(table, column, default))
+
+    for name, _, _, _ in INDEXES:
+        op.execute("ALTER INDEX {} RENAME TO {}".format(_new(name), name))
+
+
+def upgrade():
+    _convert(True, "SET DEFAULT now()")
+
+
+def downgrade():
+    _convert(False, "DROP DEFAULT")
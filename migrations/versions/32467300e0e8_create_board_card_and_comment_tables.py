@@ -8,8 +8,6 @@ Create Date: 2022-09-25 12:55:38.096925
 import sqlalchemy as sa
 from alembic import op
 
-from app.models.base import DateTime
-
 # revision identifiers, used by Alembic.
 revision = "32467300e0e8"
 down_revision = "9925c79b6be2"
@@ -22,8 +20,8 @@ def upgrade():
     op.create_table(
         "board",
         sa.Column("id", sa.Integer(), nullable=False),
-        sa.Column("date_created", DateTime(), nullable=True),
-        sa.Column("date_modified", DateTime(), nullable=True),
+        sa.Column("date_created", sa.DateTime(), nullable=True),
+        sa.Column("date_modified", sa.DateTime(), nullable=True),
         sa.Column("name", sa.String(length=100), nullable=False),
         sa.Column("description", sa.Text(), nullable=True),
         sa.Column("status", sa.Enum("active", "archived", "deleted", name="boardstatus"), nullable=False),
@@ -32,8 +30,8 @@ def upgrade():
     op.create_table(
         "board_user",
         sa.Column("id", sa.Integer(), nullable=False),
-        sa.Column("date_created", DateTime(), nullable=True),
-        sa.Column("date_modified", DateTime(), nullable=True),
+        sa.Column("date_created", sa.DateTime(), nullable=True),
+        sa.Column("date_modified", sa.DateTime(), nullable=True),
         sa.Column("user_id", sa.Integer(), nullable=True),
         sa.Column("board_id", sa.Integer(), nullable=True),
         sa.Column("role", sa.Enum("owner", "member", name="userroletype"), nullable=False),
@@ -51,8 +49,8 @@ def upgrade():
     op.create_table(
         "card",
         sa.Column("id", sa.Integer(), nullable=False),
-        sa.Column("date_created", DateTime(), nullable=True),
-        sa.Column("date_modified", DateTime(), nullable=True),
+        sa.Column("date_created", sa.DateTime(), nullable=True),
+        sa.Column("date_modified", sa.DateTime(), nullable=True),
         sa.Column("board_id", sa.Integer(), nullable=True),
         sa.Column("owner_id", sa.Integer(), nullable=True),
         sa.Column("assignment_id", sa.Integer(), nullable=True),
@@ -80,8 +78,8 @@ def upgrade():
     op.create_table(
         "comment",
         sa.Column("id", sa.Integer(), nullable=False),
-        sa.Column("date_created", DateTime(), nullable=True),
-        sa.Column("date_modified", DateTime(), nullable=True),
+        sa.Column("date_created", sa.DateTime(), nullable=True),
+        sa.Column("date_modified", sa.DateTime(), nullable=True),
         sa.Column("user_id", sa.Integer(), nullable=True),
         sa.Column("content", sa.Text(), nullable=False),
         sa.ForeignKeyConstraint(
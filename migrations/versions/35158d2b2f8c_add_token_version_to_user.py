@@ -0,0 +1,23 @@
+"""add token version to user
+
+Revision ID: 35158d2b2f8c
+Revises: 32467300e0e8
+Create Date: 2026-10-18 14:30:12.418265
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "35158d2b2f8c"
+down_revision = "32467300e0e8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("user", sa.Column("token_version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade():
+    op.drop_column("user", "token_version")
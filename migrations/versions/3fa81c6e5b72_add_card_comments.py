@@ -0,0 +1,46 @@
+"""add card comments
+
+Revision ID: 3fa81c6e5b72
+Revises: 7b2f9e0c4d18
+Create Date: 2026-10-18 20:14:37.205816
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3fa81c6e5b72"
+down_revision = "7b2f9e0c4d18"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("card", sa.Column("comment_count", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("comment", sa.Column("card_id", sa.Integer(), nullable=True))
+    op.add_column(
+        "comment",
+        sa.Column(
+            "status", sa.Enum("active", "passive", "deleted", name="status"), server_default="active", nullable=False
+        ),
+    )
+    op.create_foreign_key("comment_card_id_fkey", "comment", "card", ["card_id"], ["id"])
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comment_card_id_id",
+            "comment",
+            ["card_id", "id"],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_comment_card_id_id", table_name="comment", postgresql_concurrently=True)
+
+    op.drop_constraint("comment_card_id_fkey", "comment", type_="foreignkey")
+    op.drop_column("comment", "status")
+    op.drop_column("comment", "card_id")
+    op.drop_column("card", "comment_count")
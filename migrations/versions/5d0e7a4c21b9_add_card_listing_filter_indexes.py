@@ -0,0 +1,42 @@
+"""add card listing filter indexes
+
+Revision ID: 5d0e7a4c21b9
+Revises: aa5ff28ca3f6
+Create Date: 2026-10-18 16:20:37.514288
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5d0e7a4c21b9"
+down_revision = "aa5ff28ca3f6"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_card_board_id_state_id", ["board_id", "state", "id"]),
+    ("ix_card_board_id_assignment_id_id", ["board_id", "assignment_id", "id"]),
+    ("ix_card_board_id_owner_id_id", ["board_id", "owner_id", "id"]),
+    ("ix_card_board_id_estimated_start", ["board_id", "estimated_start"]),
+    ("ix_card_board_id_estimated_finish", ["board_id", "estimated_finish"]),
+    ("ix_card_board_id_date_modified", ["board_id", "date_modified"]),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "card",
+                columns,
+                postgresql_where=sa.text("status = 'active'"),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="card", postgresql_concurrently=True)
@@ -0,0 +1,75 @@
+"""add card position
+
+Revision ID: 7b2f9e0c4d18
+Revises: e41b7c95d2f0
+Create Date: 2026-10-18 19:02:11.518342
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7b2f9e0c4d18"
+down_revision = "e41b7c95d2f0"
+branch_labels = None
+depends_on = None
+
+
+# Rows updated per transaction of the backfill
+BATCH_SIZE = 5000
+
+# Existing cards keep their ID order within the state, "V" keeps the positions from ending with "0"
+LEGACY_POSITION = "lpad({row}id::text, 10, '0') || 'V'"
+
+
+def upgrade():
+    # The cards written by the old code during the migration get a position from the trigger
+    op.add_column("card", sa.Column("position", sa.String(length=255, collation="C"), nullable=True))
+    op.execute(
+        "CREATE FUNCTION card_legacy_position() RETURNS trigger AS $$ BEGIN "
+        "IF NEW.position IS NULL THEN NEW.position := {}; END IF; RETURN NEW; END $$ "
+        "LANGUAGE plpgsql".format(LEGACY_POSITION.format(row="NEW."))
+    )
+    op.execute(
+        "CREATE TRIGGER card_legacy_position BEFORE INSERT ON card "
+        "FOR EACH ROW EXECUTE FUNCTION card_legacy_position()"
+    )
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+
+        # Each batch is committed on its own, so the row locks are held only for one batch
+        last_id = connection.execute(sa.text("SELECT coalesce(max(id), 0) FROM card")).scalar()
+        for start in range(0, last_id, BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    "UPDATE card SET position = {} "
+                    "WHERE id > :start AND id <= :end AND position IS NULL".format(LEGACY_POSITION.format(row=""))
+                ),
+                {"start": start, "end": start + BATCH_SIZE},
+            )
+
+        # SET NOT NULL scans the table under an exclusive lock, unless a validated check constraint proves it.
+        # The constraint is validated without blocking the writes.
+        op.execute("ALTER TABLE card ADD CONSTRAINT ck_card_position_not_null CHECK (position IS NOT NULL) NOT VALID")
+        op.execute("ALTER TABLE card VALIDATE CONSTRAINT ck_card_position_not_null")
+        op.alter_column("card", "position", nullable=False)
+        op.execute("ALTER TABLE card DROP CONSTRAINT ck_card_position_not_null")
+
+        op.execute("DROP TRIGGER card_legacy_position ON card")
+        op.execute("DROP FUNCTION card_legacy_position()")
+
+        op.create_index(
+            "ix_card_board_id_state_position",
+            "card",
+            ["board_id", "state", "position"],
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_card_board_id_state_position", table_name="card", postgresql_concurrently=True)
+
+    op.drop_column("card", "position")
@@ -8,8 +8,6 @@ Create Date: 2022-09-23 22:09:53.712041
 import sqlalchemy as sa
 from alembic import op
 
-from app.models.base import DateTime
-
 # revision identifiers, used by Alembic.
 revision = "9925c79b6be2"
 down_revision = None
@@ -22,8 +20,8 @@ def upgrade():
     op.create_table(
         "user",
         sa.Column("id", sa.Integer(), nullable=False),
-        sa.Column("date_created", DateTime(), nullable=True),
-        sa.Column("date_modified", DateTime(), nullable=True),
+        sa.Column("date_created", sa.DateTime(), nullable=True),
+        sa.Column("date_modified", sa.DateTime(), nullable=True),
         sa.Column("first_name", sa.String(length=50), nullable=False),
         sa.Column("last_name", sa.String(length=50), nullable=False),
         sa.Column("email", sa.String(length=50), nullable=False),
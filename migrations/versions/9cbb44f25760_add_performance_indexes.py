@@ -0,0 +1,102 @@
+"""add performance indexes and fix board_user board foreign key
+
+Revision ID: 9cbb44f25760
+Revises: 35158d2b2f8c
+Create Date: 2026-10-18 15:02:41.731904
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.exc import IntegrityError
+
+# revision identifiers, used by Alembic.
+revision = "9cbb44f25760"
+down_revision = "35158d2b2f8c"
+branch_labels = None
+depends_on = None
+
+DUPLICATE_EMAILS = sa.text(
+    "SELECT string_agg(email, ', ' ORDER BY id) FROM \"user\" GROUP BY lower(email) HAVING count(*) > 1"
+)
+
+
+def _check_duplicate_emails():
+    # The duplicates must be merged by hand, the migration stops before any change with the list of them
+    duplicates = op.get_bind().execute(DUPLICATE_EMAILS).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            "The emails below differ only in case, merge or rename them before the upgrade:\n{}".format(
+                "\n".join(duplicates)
+            )
+        )
+
+
+def _create_email_index():
+    try:
+        op.create_index(
+            "ix_user_email_lower", "user", [sa.text("lower(email)")], unique=True, postgresql_concurrently=True
+        )
+    except IntegrityError:
+        # A duplicate was written during the build, the failed build leaves an INVALID index behind
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_user_email_lower")
+        raise
+
+
+def upgrade():
+    _check_duplicate_emails()
+
+    # board_user.board_id was pointing to user.id
+    op.execute("DELETE FROM board_user WHERE board_id NOT IN (SELECT id FROM board)")
+    op.execute(
+        "DELETE FROM board_user a USING board_user b "
+        "WHERE a.board_id = b.board_id AND a.user_id = b.user_id AND a.id > b.id"
+    )
+    op.drop_constraint("board_user_board_id_fkey", "board_user", type_="foreignkey")
+    op.create_foreign_key("board_user_board_id_fkey", "board_user", "board", ["board_id"], ["id"])
+
+    # Indexes are built concurrently so that the tables stay writable during the migration
+    with op.get_context().autocommit_block():
+        _create_email_index()
+        op.create_index(
+            "ix_board_user_board_id_user_id",
+            "board_user",
+            ["board_id", "user_id"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_board_user_user_id_status", "board_user", ["user_id", "status"], postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_card_board_id_status_id", "card", ["board_id", "status", "id"], postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_card_start_reminder",
+            "card",
+            ["estimated_start"],
+            postgresql_where=sa.text("state = 'todo' AND status = 'active'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_card_finish_reminder",
+            "card",
+            ["estimated_finish"],
+            postgresql_where=sa.text("state <> 'done' AND status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_card_finish_reminder", table_name="card")
+    op.drop_index("ix_card_start_reminder", table_name="card")
+    op.drop_index("ix_card_board_id_status_id", table_name="card")
+    op.drop_index("ix_board_user_user_id_status", table_name="board_user")
+    op.drop_index("ix_board_user_board_id_user_id", table_name="board_user")
+    op.drop_index("ix_user_email_lower", table_name="user")
+
+    # The old constraint is restored without validation, existing rows reference boards
+    op.drop_constraint("board_user_board_id_fkey", "board_user", type_="foreignkey")
+    op.execute(
+        'ALTER TABLE board_user ADD CONSTRAINT board_user_board_id_fkey FOREIGN KEY (board_id) REFERENCES "user" (id) '
+        "NOT VALID"
+    )
@@ -0,0 +1,88 @@
+"""add board and card search vectors
+
+Revision ID: aa5ff28ca3f6
+Revises: 9cbb44f25760
+Create Date: 2026-10-18 15:41:09.226017
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "aa5ff28ca3f6"
+down_revision = "9cbb44f25760"
+branch_labels = None
+depends_on = None
+
+# Rows updated per transaction of the backfill
+BATCH_SIZE = 5000
+
+# Table, the two weighted text columns of its search vector
+TABLES = (("board", "name", "description"), ("card", "title", "content"))
+
+VECTOR = (
+    "setweight(to_tsvector('simple', coalesce({row}{first}, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce({row}{second}, '')), 'B')"
+)
+
+
+def upgrade():
+    # A stored generated column would rewrite the tables under an ACCESS EXCLUSIVE lock. A nullable column without
+    # a default is only a catalog change, the trigger fills it for new writes and the rows are backfilled in batches.
+    for table, first, second in TABLES:
+        op.add_column(table, sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True))
+        op.execute(
+            "CREATE FUNCTION {table}_search_vector_update() RETURNS trigger AS $$ BEGIN "
+            "NEW.search_vector := {vector}; RETURN NEW; END $$ LANGUAGE plpgsql".format(
+                table=table, vector=VECTOR.format(row="NEW.", first=first, second=second)
+            )
+        )
+        op.execute(
+            "CREATE TRIGGER {table}_search_vector_update BEFORE INSERT OR UPDATE OF {first}, {second} ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION {table}_search_vector_update()".format(
+                table=table, first=first, second=second
+            )
+        )
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+
+        # Each batch is committed on its own, so the row locks are held only for one batch
+        for table, first, second in TABLES:
+            last_id = connection.execute(sa.text("SELECT coalesce(max(id), 0) FROM {}".format(table))).scalar()
+            for start in range(0, last_id, BATCH_SIZE):
+                connection.execute(
+                    sa.text(
+                        "UPDATE {table} SET search_vector = {vector} "
+                        "WHERE id > :start AND id <= :end AND search_vector IS NULL".format(
+                            table=table, vector=VECTOR.format(row="", first=first, second=second)
+                        )
+                    ),
+                    {"start": start, "end": start + BATCH_SIZE},
+                )
+
+        op.create_index(
+            "ix_board_search_vector",
+            "board",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_card_search_vector",
+            "card",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    op.drop_index("ix_card_search_vector", table_name="card")
+    op.drop_index("ix_board_search_vector", table_name="board")
+
+    for table, _, _ in TABLES:
+        op.execute("DROP TRIGGER {table}_search_vector_update ON {table}".format(table=table))
+        op.execute("DROP FUNCTION {}_search_vector_update()".format(table))
+        op.drop_column(table, "search_vector")
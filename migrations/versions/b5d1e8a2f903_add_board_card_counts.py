@@ -0,0 +1,36 @@
+"""add board card counts
+
+Revision ID: b5d1e8a2f903
+Revises: 3fa81c6e5b72
+Create Date: 2026-10-18 21:03:52.671940
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "b5d1e8a2f903"
+down_revision = "3fa81c6e5b72"
+branch_labels = None
+depends_on = None
+
+STATES = ("todo", "in_progress", "in_review", "done")
+
+
+def upgrade():
+    for state in STATES:
+        op.add_column("board", sa.Column("{}_count".format(state), sa.Integer(), server_default="0", nullable=False))
+
+    # Counts of the existing cards, kept up to date by the card writes afterwards
+    op.execute(
+        "UPDATE board SET {} FROM (SELECT board_id, {} FROM card WHERE status = 'active' GROUP BY board_id) AS s "
+        "WHERE board.id = s.board_id".format(
+            ", ".join("{0}_count = s.{0}".format(state) for state in STATES),
+            ", ".join("count(*) FILTER (WHERE state = '{0}') AS {0}".format(state) for state in STATES),
+        )
+    )
+
+
+def downgrade():
+    for state in reversed(STATES):
+        op.drop_column("board", "{}_count".format(state))
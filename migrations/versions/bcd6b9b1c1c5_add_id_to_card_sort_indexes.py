@@ -0,0 +1,53 @@
+"""add id to card sort indexes
+
+Revision ID: bcd6b9b1c1c5
+Revises: 086ed3dd61fc
+Create Date: 2026-10-19 14:36:20.184513
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "bcd6b9b1c1c5"
+down_revision = "086ed3dd61fc"
+branch_labels = None
+depends_on = None
+
+# The card listing sorts by (column, id), the indexes end with the id so that no sort is needed
+INDEXES = [
+    ("ix_card_board_id_estimated_start_id", ["board_id", "estimated_start", "id"]),
+    ("ix_card_board_id_estimated_finish_id", ["board_id", "estimated_finish", "id"]),
+    ("ix_card_board_id_date_created_id", ["board_id", "date_created", "id"]),
+    ("ix_card_board_id_date_modified_id", ["board_id", "date_modified", "id"]),
+]
+
+OLD_INDEXES = [
+    ("ix_card_board_id_estimated_start", ["board_id", "estimated_start"]),
+    ("ix_card_board_id_estimated_finish", ["board_id", "estimated_finish"]),
+    ("ix_card_board_id_date_modified", ["board_id", "date_modified"]),
+]
+
+
+def _replace_indexes(new: list, old: list):
+    # The new indexes are built before the old ones are dropped, so the listings are never left without an index
+    with op.get_context().autocommit_block():
+        for name, columns in new:
+            op.create_index(
+                name,
+                "card",
+                columns,
+                postgresql_where=sa.text("status = 'active'"),
+                postgresql_concurrently=True,
+            )
+
+        for name, _ in old:
+            op.drop_index(name, table_name="card", postgresql_concurrently=True)
+
+
+def upgrade():
+    _replace_indexes(INDEXES, OLD_INDEXES)
+
+
+def downgrade():
+    _replace_indexes(OLD_INDEXES, INDEXES)
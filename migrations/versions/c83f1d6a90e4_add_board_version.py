@@ -0,0 +1,23 @@
+"""add board version
+
+Revision ID: c83f1d6a90e4
+Revises: 5d0e7a4c21b9
+Create Date: 2026-10-18 16:58:02.118364
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c83f1d6a90e4"
+down_revision = "5d0e7a4c21b9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("board", sa.Column("version", sa.Integer(), server_default="0", nullable=False))
+
+
+def downgrade():
+    op.drop_column("board", "version")
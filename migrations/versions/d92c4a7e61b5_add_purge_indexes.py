@@ -0,0 +1,43 @@
+"""add purge indexes
+
+Revision ID: d92c4a7e61b5
+Revises: b5d1e8a2f903
+Create Date: 2026-10-18 21:48:09.330174
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d92c4a7e61b5"
+down_revision = "b5d1e8a2f903"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("board", sa.Column("purged_seq", sa.Integer(), server_default="0", nullable=False))
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_card_deleted_id",
+            "card",
+            ["id"],
+            postgresql_where=sa.text("status = 'deleted'"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_comment_deleted_id",
+            "comment",
+            ["id"],
+            postgresql_where=sa.text("status = 'deleted'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_comment_deleted_id", table_name="comment", postgresql_concurrently=True)
+        op.drop_index("ix_card_deleted_id", table_name="card", postgresql_concurrently=True)
+
+    op.drop_column("board", "purged_seq")
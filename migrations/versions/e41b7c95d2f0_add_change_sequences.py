@@ -0,0 +1,35 @@
+"""add change sequences
+
+Revision ID: e41b7c95d2f0
+Revises: c83f1d6a90e4
+Create Date: 2026-10-18 17:36:44.902157
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e41b7c95d2f0"
+down_revision = "c83f1d6a90e4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("board", sa.Column("seq", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("board_user", sa.Column("seq", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("card", sa.Column("seq", sa.Integer(), server_default="0", nullable=False))
+
+    with op.get_context().autocommit_block():
+        op.create_index("ix_board_user_board_id_seq", "board_user", ["board_id", "seq"], postgresql_concurrently=True)
+        op.create_index("ix_card_board_id_seq", "card", ["board_id", "seq"], postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_card_board_id_seq", table_name="card", postgresql_concurrently=True)
+        op.drop_index("ix_board_user_board_id_seq", table_name="board_user", postgresql_concurrently=True)
+
+    op.drop_column("card", "seq")
+    op.drop_column("board_user", "seq")
+    op.drop_column("board", "seq")
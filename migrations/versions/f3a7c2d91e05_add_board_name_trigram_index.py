@@ -0,0 +1,35 @@
+"""add board name trigram index
+
+Revision ID: f3a7c2d91e05
+Revises: bcd6b9b1c1c5
+Create Date: 2026-10-19 16:02:41.730218
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3a7c2d91e05"
+down_revision = "bcd6b9b1c1c5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # pg_trgm is shipped with the contrib modules of PostgreSQL, creating it needs the CREATE privilege on the database
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_board_name_trgm",
+            "board",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    # The extension is left installed, other objects of the database may use it
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_board_name_trgm", table_name="board", postgresql_concurrently=True)
@@ -38,11 +38,74 @@ class Settings:
             database_name=POSTGRESQL_DATABASE_NAME,
         ),
     )
+    # Defaults to SQLALCHEMY_DATABASE_URI with the asyncpg driver
+    SQLALCHEMY_ASYNC_DATABASE_URI = getenv("SQLALCHEMY_ASYNC_DATABASE_URI", "")
+
+    # Connection Pool Settings, applied to the sync and the async engines separately
+    DB_POOL_SIZE = int(getenv("DB_POOL_SIZE", 20))  # Connections kept open per process
+    DB_POOL_MAX_OVERFLOW = int(
+        getenv("DB_POOL_MAX_OVERFLOW", 10)
+    )  # Extra connections opened under load, closed on return
+    DB_POOL_RECYCLE = int(getenv("DB_POOL_RECYCLE", 1800))  # Second, keep it below the idle timeout of the server/proxy
+    DB_POOL_PRE_PING = getenv("DB_POOL_PRE_PING", "False").lower() == "true"  # Tests every checkout with a round trip
+    DB_POOL_TIMEOUT = int(getenv("DB_POOL_TIMEOUT", 30))  # Second, waiting for a free connection before an error
+
+    # Read Replica Settings
+    SQLALCHEMY_REPLICA_URIS = [
+        uri for uri in getenv("SQLALCHEMY_REPLICA_URIS", "").split(",") if uri
+    ]  # Comma separated
+    REPLICA_READ_YOUR_WRITES_WINDOW = int(getenv("REPLICA_READ_YOUR_WRITES_WINDOW", 10))  # Second
+    REPLICA_MAX_LAG = int(
+        getenv("REPLICA_MAX_LAG", 5)
+    )  # Second, more lagging replicas are not read until they catch up
+    REPLICA_HEALTH_CHECK_INTERVAL = int(getenv("REPLICA_HEALTH_CHECK_INTERVAL", 5))  # Second
 
     # Redis Settings
     CELERY_BROKER_URL = getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
     CELERY_RESULT_BACKEND = getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
 
+    # Cache Settings
+    CACHE_REDIS_URL = getenv("CACHE_REDIS_URL", "")  # Leave empty to use only the in-process cache
+    # Second, TTL of the user and membership caches without CACHE_REDIS_URL. The invalidations are not published to
+    # the other workers then, so their entries stay stale until they expire.
+    CACHE_LOCAL_ONLY_TTL = int(getenv("CACHE_LOCAL_ONLY_TTL", 5))
+    USER_CACHE_SIZE = int(getenv("USER_CACHE_SIZE", 10000))
+    USER_CACHE_TTL = int(getenv("USER_CACHE_TTL", 60))  # Second
+    MEMBER_CACHE_SIZE = int(getenv("MEMBER_CACHE_SIZE", 50000))
+    MEMBER_CACHE_TTL = int(getenv("MEMBER_CACHE_TTL", 300))  # Second
+
+    # Metrics Settings
+    METRICS_TOKEN = getenv("METRICS_TOKEN", "")  # Bearer token of the /metrics route, leave empty to disable it
+
+    # Password Hashing Settings
+    BCRYPT_ROUNDS = int(getenv("BCRYPT_ROUNDS", 12))  # Existing hashes are upgraded on login when changed
+    HASH_POOL_SIZE = int(getenv("HASH_POOL_SIZE", 2))  # Worker processes, 0 hashes in the request thread
+    HASH_POOL_QUEUE_SIZE = int(getenv("HASH_POOL_QUEUE_SIZE", 16))  # Waiting jobs before returning 503
+    HASH_POOL_RETRY_AFTER = int(getenv("HASH_POOL_RETRY_AFTER", 1))  # Second
+
+    # Board Settings
+    CARD_BULK_MAX_SIZE = int(getenv("CARD_BULK_MAX_SIZE", 1000))  # Items per bulk card request
+    BOARD_SNAPSHOT_CHUNK_SIZE = int(getenv("BOARD_SNAPSHOT_CHUNK_SIZE", 500))  # Cards fetched per snapshot chunk
+    BOARD_CHANGES_MAX_SIZE = int(getenv("BOARD_CHANGES_MAX_SIZE", 1000))  # More changed cards ask for a reset
+    CARD_POSITION_MAX_LENGTH = int(getenv("CARD_POSITION_MAX_LENGTH", 32))  # Longer positions are rebalanced
+    BOARD_COUNTS_RECONCILE_INTERVAL = int(getenv("BOARD_COUNTS_RECONCILE_INTERVAL", 3600))  # Second
+    BOARD_COUNTS_RECONCILE_BATCH_SIZE = int(getenv("BOARD_COUNTS_RECONCILE_BATCH_SIZE", 500))  # Boards per transaction
+
+    # Purge Settings
+    PURGE_RETENTION = int(getenv("PURGE_RETENTION", 30))  # Day, deleted boards, cards and comments are kept this long
+    PURGE_INTERVAL = int(getenv("PURGE_INTERVAL", 3600))  # Second
+    PURGE_BATCH_SIZE = int(getenv("PURGE_BATCH_SIZE", 500))  # Rows deleted per transaction
+    PURGE_BATCH_PAUSE = float(getenv("PURGE_BATCH_PAUSE", 0.1))  # Second, throttles the purge between the batches
+
+    # Reminder Settings
+    REMINDER_BATCH_SIZE = int(getenv("REMINDER_BATCH_SIZE", 1000))  # Due cards fetched per query
+    REMINDER_MAIL_CHUNK_SIZE = int(getenv("REMINDER_MAIL_CHUNK_SIZE", 50))  # Mails sent by a single Celery task
+
+    # Realtime Settings
+    REALTIME_REDIS_URL = getenv("REALTIME_REDIS_URL", CELERY_BROKER_URL)  # Leave empty to disable the board events
+    REALTIME_QUEUE_SIZE = int(getenv("REALTIME_QUEUE_SIZE", 100))  # Pending events per connection before a reset
+    REALTIME_HEARTBEAT = int(getenv("REALTIME_HEARTBEAT", 30))  # Second
+
     # Mail Settings
     MAIL_SERVER = getenv("MAIL_SERVER", "smtp.googlemail.com")
     MAIL_SERVER_PORT = getenv("MAIL_SERVER_PORT", 587)
@@ -52,6 +115,8 @@ class Settings:
     # JWT Settings
     JWT_EXPIRES_TIME = getenv("JWT_EXPIRES_TIME", 60 * 24)  # Minute
     JWT_ALGORITHM = getenv("JWT_ALGORITHM", "HS256")
+    TOKEN_CACHE_SIZE = int(getenv("TOKEN_CACHE_SIZE", 10000))  # Verified tokens kept in memory
+    TOKEN_CACHE_TTL = int(getenv("TOKEN_CACHE_TTL", 300))  # Second
 
     # Author Settings
     AUTHOR_NAME = "Yunus Emre Geldegül"